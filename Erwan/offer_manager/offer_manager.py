@@ -3,7 +3,7 @@ OfferManager - Main class for managing freelance job offers
 """
 
 from datetime import datetime, date
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
 import json
 import pickle
 import uuid
@@ -65,6 +65,25 @@ class OfferManager:
         
         return offer_id
     
+    def add_offers(self, standard_offers: Iterable[StandardOffer]) -> List[str]:
+        """
+        Add several offers at once.
+        
+        Args:
+            standard_offers: StandardOffer instances to add
+            
+        Returns:
+            List[str]: The generated offer IDs, in the same order
+            
+        Raises:
+            TypeError: If any offer is not a StandardOffer instance (none are added)
+        """
+        standard_offers = list(standard_offers)
+        if not all(isinstance(offer, StandardOffer) for offer in standard_offers):
+            raise TypeError("Offer must be an instance of StandardOffer")
+        
+        return [self.add_offer(offer) for offer in standard_offers]
+    
     def list_offers(self, format_output: bool = True) -> Union[List[Dict[str, Any]], str]:
         """
         Display summary of all offers.
@@ -124,6 +143,18 @@ class OfferManager:
         """
         return self._full_offers.get(offer_id)
     
+    def get_offers_with_details(self) -> List[Tuple[Dict[str, Any], StandardOffer]]:
+        """
+        Retrieve every offer summary together with its full offer.
+        
+        Returns:
+            List of (summary, StandardOffer) pairs, in insertion order
+        """
+        full_offers = self._full_offers
+        return [(summary, full_offers[offer_id])
+                for offer_id, summary in self._offers.items()
+                if offer_id in full_offers]
+    
     def update_status(self, offer_id: str, status: str) -> bool:
         """
         Update offer status.
@@ -301,7 +332,7 @@ class OfferManager:
                     "full_offers": self._full_offers
                 }
                 with open(filename, 'wb') as f:
-                    pickle.dump(data, f)
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
             
             return True
             
@@ -356,6 +387,64 @@ class OfferManager:
             print(f"Error loading from file: {e}")
             return False
     
+    def append_status_journal(self, filename: str, offer_id: str, status: str) -> bool:
+        """
+        Append a status change to a JSON Lines journal.
+        
+        Much cheaper than rewriting a full save for every update; replay the
+        journal with replay_status_journal() after loading the last full save.
+        
+        Args:
+            filename: Journal file path
+            offer_id: The updated offer ID
+            status: Its new status
+            
+        Returns:
+            bool: True if appended successfully
+        """
+        try:
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"op": "status", "id": offer_id, "status": status}) + "\n")
+            return True
+            
+        except Exception as e:
+            print(f"Error appending to journal: {e}")
+            return False
+    
+    def replay_status_journal(self, filename: str) -> int:
+        """
+        Apply the status changes recorded by append_status_journal().
+        
+        Entries for unknown offers, invalid statuses and unreadable lines
+        (e.g. a write cut short by a crash) are skipped.
+        
+        Args:
+            filename: Journal file path
+            
+        Returns:
+            int: Number of status changes applied
+        """
+        applied = 0
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if (entry.get("op") == "status"
+                            and entry.get("status") in self.VALID_STATUSES
+                            and entry.get("id") in self._offers):
+                        self._offers[entry["id"]]["status"] = entry["status"]
+                        applied += 1
+                        
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error replaying journal: {e}")
+            
+        return applied
+    
     def __len__(self) -> int:
         """Return number of offers."""
         return len(self._offers)
@@ -133,6 +133,10 @@ class WebSocketManager {
         console.log('⚠️ Sending system message to popup');
         this.notifyPopup('SYSTEM_MESSAGE', data.message);
         break;
+      case 'batch':
+        console.log('📦 Received batch of', data.messages?.length || 0, 'messages');
+        (data.messages || []).forEach((message) => this.handleServerMessage(message));
+        break;
       default:
         console.error('❌ Unknown message type:', data.type, 'Full data:', data);
     }
@@ -123,6 +123,10 @@ class WebSocketManager {
         console.log('⚠️  Sending system_message to content script');
         this.notifyContentScript('SYSTEM_MESSAGE', data.message);
         break;
+      case 'batch':
+        console.log('📦 Received batch of', data.messages?.length || 0, 'messages');
+        (data.messages || []).forEach((message) => this.handleServerMessage(message));
+        break;
       default:
         console.error('❌ Unknown message type:', data.type, 'Full data:', data);
     }
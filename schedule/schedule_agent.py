@@ -1,13 +1,27 @@
 import json
 import datetime
+import bisect
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from smolagents import CodeAgent, Tool
 import re
+import sys
 
-@dataclass
+# Abbreviated weekday names indexed by date.weekday() (Monday == 0)
+DAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# Emoji mappings shared by every schedule display
+PRIORITY_EMOJIS = {
+    5: "🔥", 4: "⭐", 3: "📋", 2: "📝", 1: "💭"
+}
+
+DAY_EMOJIS = {
+    0: "🌙", 1: "🌅", 2: "🌞", 3: "🌅", 4: "🌟", 5: "🎉", 6: "🌙"
+}
+
+@dataclass(slots=True)
 class Event:
-    """Represents a calendar event"""
+    """Represents a calendar event (slotted: no per-instance __dict__)"""
     title: str
     start_time: datetime.datetime
     end_time: datetime.datetime
@@ -52,20 +66,27 @@ class ScheduleManager:
     
     def __init__(self, storage_file: str = "schedule.json"):
         self.storage_file = storage_file
+        # Always sorted by start time: new events are inserted in place with
+        # bisect, and code that changes a start time must re-sort the list
         self.events: List[Event] = []
+        # Memoized get_all_conflicts() result, reset whenever events are loaded or saved
+        self._conflicts_cache: Optional[List[Tuple[Event, Event]]] = None
         self.load_events()
     
     def load_events(self):
         """Load events from storage file"""
+        self._conflicts_cache = None
         try:
             with open(self.storage_file, 'r') as f:
                 data = json.load(f)
                 self.events = [Event.from_dict(event_data) for event_data in data]
+                self.events.sort(key=lambda e: e.start_time)
         except (FileNotFoundError, json.JSONDecodeError):
             self.events = []
     
     def save_events(self):
         """Save events to storage file"""
+        self._conflicts_cache = None
         with open(self.storage_file, 'w') as f:
             json.dump([event.to_dict() for event in self.events], f, indent=2)
     
@@ -73,8 +94,7 @@ class ScheduleManager:
         """Add an event and check for conflicts"""
         conflicts = self.find_conflicts(event)
         
-        self.events.append(event)
-        self.events.sort(key=lambda e: e.start_time)
+        bisect.insort(self.events, event, key=lambda e: e.start_time)
         self.save_events()
         
         result = {
@@ -107,21 +127,37 @@ class ScheduleManager:
             }
     
     def find_conflicts(self, target_event: Event) -> List[Event]:
-        """Find all events that conflict with the target event"""
-        conflicts = []
-        for event in self.events:
-            if event.overlaps_with(target_event):
-                conflicts.append(event)
-        return conflicts
+        """Find all events that conflict with the target event
+        
+        Only events starting before the target ends can overlap it; since
+        self.events is sorted by start time they are found with a bisect.
+        """
+        events = self.events
+        end = bisect.bisect_left(events, target_event.end_time, key=lambda e: e.start_time)
+        start_time = target_event.start_time
+        return [events[i] for i in range(end) if events[i].end_time > start_time]
     
     def get_all_conflicts(self) -> List[Tuple[Event, Event]]:
-        """Find all conflicting event pairs"""
-        conflicts = []
-        for i, event1 in enumerate(self.events):
-            for event2 in self.events[i+1:]:
-                if event1.overlaps_with(event2):
+        """Find all conflicting event pairs
+        
+        The result is memoized until the next load_events() or save_events(),
+        so code that edits events in place must save them afterwards.
+        """
+        if self._conflicts_cache is None:
+            conflicts = []
+            events = self.events
+            n = len(events)
+            for i, event1 in enumerate(events):
+                # Later events start no earlier than event1, so they overlap it
+                # exactly until the first one starting at or after its end
+                end_time = event1.end_time
+                for j in range(i + 1, n):
+                    event2 = events[j]
+                    if event2.start_time >= end_time:
+                        break
                     conflicts.append((event1, event2))
-        return conflicts
+            self._conflicts_cache = conflicts
+        return list(self._conflicts_cache)
     
     def suggest_conflict_resolution(self, event1: Event, event2: Event) -> List[str]:
         """Suggest ways to resolve conflicts between two events"""
@@ -161,7 +197,11 @@ class ScheduleManager:
     
     def get_schedule(self, start_date: Optional[datetime.date] = None, 
                     end_date: Optional[datetime.date] = None) -> List[Event]:
-        """Get events within a date range"""
+        """Get events within a date range, in chronological order
+        
+        self.events is kept sorted by start time (on load, add and update),
+        so callers can rely on the returned list being ordered.
+        """
         if start_date is None:
             start_date = datetime.date.today()
         if end_date is None:
@@ -409,13 +449,25 @@ class UpdateEventTool(Tool):
                     "message": f"Event '{old_title}' not found"
                 })
             
+            # Validate the new times before changing anything, so a rejected
+            # update leaves the (sorted, saved) schedule untouched
+            start_time = event_to_update.start_time
+            end_time = event_to_update.end_time
+            if new_start_time is not None:
+                start_time = datetime.datetime.strptime(new_start_time, '%Y-%m-%d %H:%M')
+            if new_end_time is not None:
+                end_time = datetime.datetime.strptime(new_end_time, '%Y-%m-%d %H:%M')
+            if start_time >= end_time:
+                return json.dumps({
+                    "success": False,
+                    "message": "Start time must be before end time"
+                })
+            
             # Update fields only if new values are provided
+            event_to_update.start_time = start_time
+            event_to_update.end_time = end_time
             if new_title is not None:
                 event_to_update.title = new_title
-            if new_start_time is not None:
-                event_to_update.start_time = datetime.datetime.strptime(new_start_time, '%Y-%m-%d %H:%M')
-            if new_end_time is not None:
-                event_to_update.end_time = datetime.datetime.strptime(new_end_time, '%Y-%m-%d %H:%M')
             if new_description is not None:
                 event_to_update.description = new_description
             if new_location is not None:
@@ -423,19 +475,14 @@ class UpdateEventTool(Tool):
             if new_priority is not None and new_priority > 0:
                 event_to_update.priority = new_priority
             
-            # Validate updated event
-            if event_to_update.start_time >= event_to_update.end_time:
-                return json.dumps({
-                    "success": False,
-                    "message": "Start time must be before end time"
-                })
-            
             # Check for new conflicts
             conflicts = []
             for other_event in self.schedule_manager.events:
                 if other_event != event_to_update and event_to_update.overlaps_with(other_event):
                     conflicts.append(other_event)
             
+            # Keep events in chronological order after a time change
+            self.schedule_manager.events.sort(key=lambda e: e.start_time)
             self.schedule_manager.save_events()
             
             result = {
@@ -494,7 +541,7 @@ class BeautifulScheduleTool(Tool):
         super().__init__()
         self.schedule_manager = schedule_manager
         
-        # Color and styling constants
+        # Color and styling constants (interned, they are reused on every row)
         self.colors = {
             'header': '\033[95m',      # Magenta
             'date': '\033[94m',        # Blue
@@ -510,15 +557,31 @@ class BeautifulScheduleTool(Tool):
             'bold': '\033[1m',         # Bold
             'underline': '\033[4m'     # Underline
         }
+        self.colors = {key: sys.intern(code) for key, code in self.colors.items()}
         
         # Emoji mappings
-        self.priority_emojis = {
-            5: "🔥", 4: "⭐", 3: "📋", 2: "📝", 1: "💭"
-        }
+        self.priority_emojis = PRIORITY_EMOJIS
+        # Same emojis indexed by priority (index 0 is the fallback)
+        self._emoji_by_prio = ("📋",) + tuple(self.priority_emojis[p] for p in range(1, 6))
         
-        self.day_emojis = {
-            0: "🌙", 1: "🌅", 2: "🌞", 3: "🌅", 4: "🌟", 5: "🎉", 6: "🌙"
-        }
+        self.day_emojis = DAY_EMOJIS
+        
+        # Static blocks of the compact view, built once instead of per render
+        self._compact_header = "\n".join((
+            f"\n{self.colors['header']}{self.colors['bold']}",
+            "━" * 72,
+            "                            📊 COMPACT SCHEDULE",
+            "━" * 72,
+            self.colors['end']
+        ))
+        self._compact_table_top = "\n".join((
+            self.colors['bold'],
+            "┌─────────────┬───────────────┬─────────────────────────────────────────┐",
+            "│    DATE     │     TIME      │                 EVENT                   │",
+            "├─────────────┼───────────────┼─────────────────────────────────────────┤",
+            self.colors['end']
+        ))
+        self._compact_table_bottom = "└─────────────┴───────────────┴─────────────────────────────────────────┘"
     
     def forward(self, start_date: str = "", days: int = 7, 
                 view_type: str = "timeline", show_conflicts: bool = True) -> str:
@@ -563,6 +626,7 @@ class BeautifulScheduleTool(Tool):
     def _create_timeline_view(self, events: List, start_date: datetime.date, 
                              end_date: datetime.date, conflicts: List[str]) -> str:
         """Create a timeline-style view of the schedule"""
+        emoji_table = self._emoji_by_prio
         output = []
         
         # Header
@@ -604,7 +668,7 @@ class BeautifulScheduleTool(Tool):
                 
                 for i, event in enumerate(day_events):
                     is_conflict = event.title in conflicts
-                    priority_emoji = self.priority_emojis.get(event.priority, "📋")
+                    priority_emoji = emoji_table[event.priority] if 0 < event.priority < 6 else "📋"
                     
                     # Time display
                     start_time = event.start_time.strftime('%H:%M')
@@ -652,6 +716,7 @@ class BeautifulScheduleTool(Tool):
     def _create_agenda_view(self, events: List, start_date: datetime.date, 
                            end_date: datetime.date, conflicts: List[str]) -> str:
         """Create an agenda-style view of the schedule"""
+        emoji_table = self._emoji_by_prio
         output = []
         
         # Header
@@ -670,7 +735,7 @@ class BeautifulScheduleTool(Tool):
         
         for i, event in enumerate(sorted_events):
             is_conflict = event.title in conflicts
-            priority_emoji = self.priority_emojis.get(event.priority, "📋")
+            priority_emoji = emoji_table[event.priority] if 0 < event.priority < 6 else "📋"
             priority_color = self._get_priority_color(event.priority)
             
             # Event header
@@ -712,6 +777,7 @@ class BeautifulScheduleTool(Tool):
     def _create_calendar_view(self, events: List, start_date: datetime.date, 
                              end_date: datetime.date, conflicts: List[str]) -> str:
         """Create a calendar grid view of the schedule"""
+        emoji_table = self._emoji_by_prio
         output = []
         
         # Header
@@ -729,12 +795,12 @@ class BeautifulScheduleTool(Tool):
                 events_by_date[event_date] = []
             events_by_date[event_date].append(event)
         
-        # Create calendar grid
-        current_date = start_date
-        while current_date <= end_date:
+        # Create calendar grid (days are walked as ordinals, no timedelta per step)
+        for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1):
+            current_date = datetime.date.fromordinal(ordinal)
             day_events = events_by_date.get(current_date, [])
-            day_name = current_date.strftime('%a')
-            day_num = current_date.strftime('%d')
+            day_name = DAY_NAMES[current_date.weekday()]
+            day_num = f"{current_date.day:02d}"
             
             # Day header
             if day_events:
@@ -752,7 +818,7 @@ class BeautifulScheduleTool(Tool):
                 # Show events for this day
                 for event in sorted(day_events, key=lambda x: x.start_time):
                     time_str = f"{event.start_time.strftime('%H:%M')}-{event.end_time.strftime('%H:%M')}"
-                    priority_emoji = self.priority_emojis.get(event.priority, "📋")
+                    priority_emoji = emoji_table[event.priority] if 0 < event.priority < 6 else "📋"
                     
                     if event.title in conflicts:
                         output.append(f"   ⚠️  {time_str} {priority_emoji} {event.title}")
@@ -764,69 +830,77 @@ class BeautifulScheduleTool(Tool):
                 output.append(f"{self.colors['description']}{day_name} {day_num} │ No events{self.colors['end']}")
             
             output.append("")
-            current_date += datetime.timedelta(days=1)
         
         return "\n".join(output)
     
     def _create_compact_view(self, events: List, start_date: datetime.date, 
                            end_date: datetime.date, conflicts: List[str]) -> str:
         """Create a compact view of the schedule"""
-        output = []
-        
+        return "\n".join(self._iter_compact_view(events, start_date, end_date, conflicts))
+    
+    def _iter_compact_view(self, events: List, start_date: datetime.date, 
+                           end_date: datetime.date, conflicts: List[str]):
+        """Yield the lines of the compact view one at a time"""
+        emoji_table = self._emoji_by_prio
         # Header
-        output.append(f"\n{self.colors['header']}{self.colors['bold']}")
-        output.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        output.append("                            📊 COMPACT SCHEDULE")
-        output.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        output.append(f"{self.colors['end']}")
+        yield self._compact_header
         
         if not events:
-            output.append(f"\n{self.colors['description']}🌟 No events scheduled{self.colors['end']}")
-            return "\n".join(output)
+            yield f"\n{self.colors['description']}🌟 No events scheduled{self.colors['end']}"
+            return
         
         # Sort events by start time
         sorted_events = sorted(events, key=lambda x: x.start_time)
         
         # Create compact table
-        output.append(f"{self.colors['bold']}")
-        output.append("┌─────────────┬───────────────┬─────────────────────────────────────────┐")
-        output.append("│    DATE     │     TIME      │                 EVENT                   │")
-        output.append("├─────────────┼───────────────┼─────────────────────────────────────────┤")
-        output.append(f"{self.colors['end']}")
+        yield self._compact_table_top
         
+        # Hoist everything that does not depend on the event out of the row loop
+        colors = self.colors
+        end = colors['end']
+        conflict_color = colors['conflict']
+        date_color = colors['date']
+        time_color = colors['time']
+        color_table = tuple(self._get_priority_color(p) for p in range(6))
+        
+        conflict_count = 0
         for event in sorted_events:
-            date_str = event.start_time.strftime('%m/%d')
-            time_str = f"{event.start_time.strftime('%H:%M')}-{event.end_time.strftime('%H:%M')}"
-            priority_emoji = self.priority_emojis.get(event.priority, "📋")
+            start_time = event.start_time
+            end_time = event.end_time
+            priority = event.priority
+            
+            # Format with integer fields instead of strftime, and pad columns
+            # with str methods rather than format specs
+            date_str = f"{start_time.month:02d}/{start_time.day:02d}".center(9)
+            time_str = (f"{start_time.hour:02d}:{start_time.minute:02d}-"
+                        f"{end_time.hour:02d}:{end_time.minute:02d}").center(11)
+            priority_emoji = emoji_table[priority] if 0 < priority < 6 else "📋"
             
             # Truncate title if too long
             title = event.title
             if len(title) > 35:
                 title = title[:32] + "..."
+            title = title.ljust(35)
             
             if event.title in conflicts:
-                output.append(f"│ {self.colors['conflict']} {date_str:^9} {self.colors['end']} │ "
-                            f"{self.colors['conflict']} {time_str:^11} {self.colors['end']} │ "
-                            f"{self.colors['conflict']} ⚠️ {priority_emoji} {title:<35} {self.colors['end']} │")
+                conflict_count += 1
+                yield (f"│ {conflict_color} {date_str} {end} │ "
+                       f"{conflict_color} {time_str} {end} │ "
+                       f"{conflict_color} ⚠️ {priority_emoji} {title} {end} │")
             else:
-                priority_color = self._get_priority_color(event.priority)
-                output.append(f"│ {self.colors['date']} {date_str:^9} {self.colors['end']} │ "
-                            f"{self.colors['time']} {time_str:^11} {self.colors['end']} │ "
-                            f"{priority_color} {priority_emoji} {title:<35} {self.colors['end']} │")
+                priority_color = color_table[priority] if 0 <= priority < 6 else self._get_priority_color(priority)
+                yield (f"│ {date_color} {date_str} {end} │ "
+                       f"{time_color} {time_str} {end} │ "
+                       f"{priority_color} {priority_emoji} {title} {end} │")
         
-        output.append("└─────────────┴───────────────┴─────────────────────────────────────────┘")
+        yield self._compact_table_bottom
         
         # Summary
-        total_events = len(events)
-        conflict_events = len([e for e in events if e.title in conflicts])
-        
-        output.append(f"\n{self.colors['description']}")
-        output.append(f"📊 Summary: {total_events} events")
-        if conflict_events > 0:
-            output.append(f"⚠️  {conflict_events} events have conflicts")
-        output.append(f"{self.colors['end']}")
-        
-        return "\n".join(output)
+        yield f"\n{self.colors['description']}"
+        yield f"📊 Summary: {len(events)} events"
+        if conflict_count > 0:
+            yield f"⚠️  {conflict_count} events have conflicts"
+        yield f"{self.colors['end']}"
     
     def _get_priority_color(self, priority: int) -> str:
         """Get color based on priority level"""
@@ -839,6 +913,16 @@ class BeautifulScheduleTool(Tool):
     
     def _wrap_text(self, text: str, width: int) -> List[str]:
         """Wrap text to specified width"""
+        # Fast paths for single-line text: short text that is already
+        # normalized (no leading, trailing or doubled spaces) fits as-is (the
+        # word loop counts a space after every word, hence < width), and an
+        # unbroken run without spaces is cut into fixed-width chunks
+        if text.isprintable():
+            if len(text) < width and text[:1] != ' ' and text[-1:] != ' ' and '  ' not in text:
+                return [text]
+            if ' ' not in text:
+                return [text[i:i + width] for i in range(0, len(text), width)]
+
         words = text.split()
         lines = []
         current_line = []
@@ -1,105 +1,27 @@
 import json
 import datetime
-from typing import List, Dict, Any, Optional
+import functools
+import io
+from typing import List, Dict, Any, Optional, Set, Tuple, TextIO
+from collections import defaultdict
 from smolagents import Tool
 import os
+import threading
 import webbrowser
 from pathlib import Path
+from html import escape as _esc
 
-class ScheduleWebViewTool(Tool):
-    name = "view_schedule_web"
-    description = "Display schedule in a beautiful web interface"
-    
-    inputs = {
-        "start_date": {
-            "type": "string",
-            "description": "Start date in format 'YYYY-MM-DD' (default: today)",
-            "default": "",
-            "nullable": True
-        },
-        "days": {
-            "type": "integer",
-            "description": "Number of days to show (default: 7)",
-            "default": 7,
-            "nullable": True
-        },
-        "view_type": {
-            "type": "string",
-            "description": "View type: 'calendar', 'timeline', or 'list' (default: 'calendar')",
-            "default": "calendar",
-            "nullable": True
-        },
-        "open_browser": {
-            "type": "boolean",
-            "description": "Whether to automatically open in browser (default: true)",
-            "default": True,
-            "nullable": True
-        }
-    }
-    
-    output_type = "string"
-    
-    def __init__(self, schedule_manager):
-        super().__init__()
-        self.schedule_manager = schedule_manager
-    
-    def forward(self, start_date: str = "", days: int = 7, 
-                view_type: str = "calendar", open_browser: bool = True) -> str:
-        """Generate and display a beautiful web interface for the schedule"""
-        try:
-            # Parse dates
-            if start_date:
-                start = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-            else:
-                start = datetime.date.today()
-            
-            end = start + datetime.timedelta(days=days-1)
-            events = self.schedule_manager.get_schedule(start, end)
-            
-            # Generate HTML based on view type
-            if view_type == "calendar":
-                html_content = self._generate_calendar_view(events, start, end)
-            elif view_type == "timeline":
-                html_content = self._generate_timeline_view(events, start, end)
-            else:  # list view
-                html_content = self._generate_list_view(events, start, end)
-            
-            # Save to file
-            file_path = Path("schedule_view.html")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Open in browser if requested
-            if open_browser:
-                webbrowser.open(f"file://{file_path.absolute()}")
-            
-            return json.dumps({
-                "success": True,
-                "message": f"Schedule web view generated successfully",
-                "file_path": str(file_path.absolute()),
-                "view_type": view_type,
-                "period": f"{start} to {end}",
-                "total_events": len(events),
-                "browser_opened": open_browser
-            }, indent=2)
-            
-        except Exception as e:
-            return json.dumps({
-                "success": False,
-                "message": f"Error generating web view: {str(e)}"
-            })
-    
-    def _get_base_html_template(self, title: str, additional_styles: str = "") -> str:
-        """Base HTML template with modern styling"""
-        return f"""
+# Static pieces of the page head. The CSS is a plain string (no f-string
+# brace escaping) so the template is assembled by concatenation only.
+_HTML_HEAD_OPEN = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        :root {{
+    <title>"""
+
+_BASE_CSS = """        :root {
             --primary-color: #4f46e5;
             --secondary-color: #e0e7ff;
             --success-color: #10b981;
@@ -112,54 +34,54 @@ class ScheduleWebViewTool(Tool):
             --text-secondary: #6b7280;
             --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
             --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
             color: var(--text-primary);
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 16px;
             box-shadow: var(--shadow-lg);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, var(--primary-color), #6366f1);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5rem;
             font-weight: 700;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header p {{
+        .header p {
             font-size: 1.1rem;
             opacity: 0.9;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 30px;
-        }}
+        }
         
-        .event-card {{
+        .event-card {
             background: white;
             border-radius: 12px;
             padding: 20px;
@@ -167,180 +89,427 @@ class ScheduleWebViewTool(Tool):
             box-shadow: var(--shadow);
             border-left: 4px solid var(--primary-color);
             transition: transform 0.2s ease, box-shadow 0.2s ease;
-        }}
+        }
         
-        .event-card:hover {{
+        .event-card:hover {
             transform: translateY(-2px);
             box-shadow: var(--shadow-lg);
-        }}
+        }
         
-        .event-title {{
+        .event-title {
             font-size: 1.25rem;
             font-weight: 600;
             color: var(--text-primary);
             margin-bottom: 8px;
-        }}
+        }
         
-        .event-time {{
+        .event-time {
             color: var(--primary-color);
             font-weight: 500;
             margin-bottom: 8px;
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
+        }
         
-        .event-details {{
+        .event-details {
             color: var(--text-secondary);
             font-size: 0.9rem;
             line-height: 1.5;
-        }}
+        }
         
-        .event-meta {{
+        .event-meta {
             display: flex;
             gap: 12px;
             margin-top: 12px;
             flex-wrap: wrap;
-        }}
+        }
         
-        .meta-item {{
+        .meta-item {
             display: flex;
             align-items: center;
             gap: 4px;
             font-size: 0.85rem;
             color: var(--text-secondary);
-        }}
+        }
         
-        .priority-badge {{
+        .priority-badge {
             display: inline-block;
             padding: 4px 8px;
             border-radius: 12px;
             font-size: 0.75rem;
             font-weight: 500;
             text-transform: uppercase;
-        }}
+        }
         
-        .priority-1 {{ background: #f3f4f6; color: #6b7280; }}
-        .priority-2 {{ background: #dbeafe; color: #1d4ed8; }}
-        .priority-3 {{ background: #fef3c7; color: #d97706; }}
-        .priority-4 {{ background: #fed7aa; color: #ea580c; }}
-        .priority-5 {{ background: #fecaca; color: #dc2626; }}
+        .priority-1 { background: #f3f4f6; color: #6b7280; }
+        .priority-2 { background: #dbeafe; color: #1d4ed8; }
+        .priority-3 { background: #fef3c7; color: #d97706; }
+        .priority-4 { background: #fed7aa; color: #ea580c; }
+        .priority-5 { background: #fecaca; color: #dc2626; }
         
-        .conflict-warning {{
+        .conflict-warning {
             background: #fef2f2;
             border-left-color: var(--danger-color);
             border: 1px solid #fecaca;
-        }}
+        }
         
-        .conflict-badge {{
+        .conflict-badge {
             background: var(--danger-color);
             color: white;
             padding: 2px 8px;
             border-radius: 8px;
             font-size: 0.7rem;
             font-weight: 600;
-        }}
+        }
         
-        .no-events {{
+        .no-events {
             text-align: center;
             padding: 60px 20px;
             color: var(--text-secondary);
-        }}
+        }
         
-        .no-events-icon {{
+        .no-events-icon {
             font-size: 4rem;
             margin-bottom: 20px;
             opacity: 0.5;
-        }}
+        }
         
-        .stats {{
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: var(--light-color);
             padding: 20px;
             border-radius: 12px;
             text-align: center;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .stat-number {{
+        .stat-number {
             font-size: 2rem;
             font-weight: 700;
             color: var(--primary-color);
             margin-bottom: 8px;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: var(--text-secondary);
             font-size: 0.9rem;
-        }}
+        }
         
-        .icon {{
+        .icon {
             width: 16px;
             height: 16px;
             fill: currentColor;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 margin: 10px;
                 border-radius: 12px;
-            }}
+            }
             
-            .header {{
+            .header {
                 padding: 20px;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 font-size: 2rem;
-            }}
+            }
             
-            .content {{
+            .content {
                 padding: 20px;
-            }}
+            }
             
-            .stats {{
+            .stats {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
         
-        {additional_styles}
+"""
+
+_HTML_HEAD_STYLE = "</title>\n    <style>\n" + _BASE_CSS + "        "
+
+_HTML_HEAD_CLOSE = """
     </style>
 </head>
 <body>
 """
+
+# CSS classes and fragments shared by every event row
+_CARD = "event-card"
+_CARD_CONFLICT = "event-card conflict-warning"
+_CONFLICT_BADGE = '<span class="conflict-badge">CONFLICT</span>'
+_DAY_EVENT = "day-event"
+_DAY_EVENT_CONFLICT = "day-event conflict"
+_DAY_EVENT_HIGH = "day-event high-priority"
+_TIMELINE_ITEM = "timeline-item"
+_TIMELINE_ITEM_CONFLICT = "timeline-item conflict"
+_EMPTY = ""
+
+# Per-event card markup, filled with format_map() from the rows built by
+# ScheduleWebViewTool._index_events (optional blocks are "" when empty)
+_LIST_EVENT_TPL = """
+                    <div class="{card_class}">
+                        <div class="event-title">
+                            {title_html}
+                            {conflict_badge}
+                        </div>
+                        <div class="event-time">
+                            🕐 {start_12} - {end_12}
+                            <span style="color: var(--text-secondary);">({duration})</span>
+                        </div>
+                        
+                        {description_block}
+                        
+                        <div class="event-meta">
+                            {location_block}
+                            <div class="meta-item">
+                                <span class="priority-badge priority-{priority}">
+                                    Priority {priority}
+                                </span>
+                            </div>
+                        </div>
+                    </div>
+                    """
+
+_TIMELINE_EVENT_TPL = """
+                    <div class="{card_class}" style="margin-bottom: 12px;">
+                        <div class="event-title">
+                            {title_html}
+                            {conflict_badge}
+                        </div>
+                        <div class="event-time">
+                            🕐 {start_12} - {end_12}
+                        </div>
+                        {description_block}
+                        <div class="event-meta">
+                            {location_block}
+                            <div class="meta-item">
+                                <span class="priority-badge priority-{priority}">
+                                    Priority {priority}
+                                </span>
+                            </div>
+                        </div>
+                    </div>
+                    """
+
+# Rough size of a rendered page, used to size the output file buffer so a
+# typical page is written in one go without over-allocating for small ones
+_PAGE_BASE_BYTES = 16 * 1024
+_PAGE_BYTES_PER_EVENT = 1024
+_MAX_WRITE_BUFFER = 1 << 20
+# Day-of-month numbers as strings, indexed by date.day
+_DAY_STR = [""] + [str(day) for day in range(1, 32)]
+
+# Buffer sizes are rounded up to whole blocks so every flush is block aligned
+_WRITE_BLOCK = io.DEFAULT_BUFFER_SIZE
+
+# Empty-range pages kept per ScheduleWebViewTool
+_MAX_EMPTY_PAGES = 32
+
+@functools.lru_cache(maxsize=512)
+def _fmt_day_header(day: datetime.date) -> str:
+    """Format a date as a day heading, e.g. 'Monday, March 04, 2024' (cached per date)"""
+    return day.strftime('%A, %B %d, %Y')
+
+def _fmt_time_12(t: datetime.datetime) -> str:
+    """Format a time like strftime('%I:%M %p') without going through strftime"""
+    return f"{t.hour % 12 or 12:02d}:{t.minute:02d} {'PM' if t.hour >= 12 else 'AM'}"
+
+class ScheduleWebViewTool(Tool):
+    name = "view_schedule_web"
+    description = "Display schedule in a beautiful web interface"
     
-    def _generate_list_view(self, events: List, start_date: datetime.date, end_date: datetime.date) -> str:
-        """Generate a beautiful list view of events"""
-        
-        # Group events by date
-        events_by_date = {}
+    inputs = {
+        "start_date": {
+            "type": "string",
+            "description": "Start date in format 'YYYY-MM-DD' (default: today)",
+            "default": "",
+            "nullable": True
+        },
+        "days": {
+            "type": "integer",
+            "description": "Number of days to show (default: 7)",
+            "default": 7,
+            "nullable": True
+        },
+        "view_type": {
+            "type": "string",
+            "description": "View type: 'calendar', 'timeline', or 'list' (default: 'calendar')",
+            "default": "calendar",
+            "nullable": True
+        },
+        "open_browser": {
+            "type": "boolean",
+            "description": "Whether to automatically open in browser (default: true)",
+            "default": True,
+            "nullable": True
+        }
+    }
+    
+    output_type = "string"
+    
+    def __init__(self, schedule_manager):
+        super().__init__()
+        self.schedule_manager = schedule_manager
+        self._empty_pages: Dict[Tuple[str, datetime.date, datetime.date, datetime.date], str] = {}
+    
+    def forward(self, start_date: str = "", days: int = 7, 
+                view_type: str = "calendar", open_browser: bool = True) -> str:
+        """Generate and display a beautiful web interface for the schedule"""
+        try:
+            # Parse dates
+            if start_date:
+                start = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
+            else:
+                start = datetime.date.today()
+            
+            end = start + datetime.timedelta(days=days-1)
+            events = self.schedule_manager.get_schedule(start, end)
+            
+            file_path = Path("schedule_view.html")
+            if not events:
+                # An empty range always renders the same page, so reuse it
+                file_path.write_text(self._empty_html(view_type, start, end, datetime.date.today()),
+                                     encoding='utf-8')
+            else:
+                # Identities of conflicting events, computed once for whichever view is
+                # rendered (get_schedule and get_all_conflicts share the same Event objects,
+                # so two different events with the same title are not confused)
+                conflict_ids = {id(event)
+                                for pair in self.schedule_manager.get_all_conflicts()
+                                for event in pair}
+                
+                # Generate HTML based on view type, streaming fragments straight
+                # into a write buffer sized for the page instead of building it in memory
+                buffer_size = _PAGE_BASE_BYTES + _PAGE_BYTES_PER_EVENT * len(events)
+                buffer_size = min(-(-buffer_size // _WRITE_BLOCK) * _WRITE_BLOCK, _MAX_WRITE_BUFFER)
+                with open(file_path, 'w', encoding='utf-8', buffering=buffer_size) as out:
+                    self._generate_view(view_type, events, start, end, conflict_ids, out)
+            
+            # Open in browser if requested, without waiting for the browser to start
+            if open_browser:
+                threading.Thread(target=webbrowser.open, args=(f"file://{file_path.absolute()}",),
+                                 daemon=True).start()
+            
+            # Same text as json.dumps(..., indent=2) of the status dict; only the
+            # path and view type can need escaping
+            return ('{\n  "success": true,'
+                    '\n  "message": "Schedule web view generated successfully",'
+                    '\n  "file_path": ' + json.dumps(str(file_path.absolute())) + ','
+                    '\n  "view_type": ' + json.dumps(view_type) + ','
+                    '\n  "period": "' + start.isoformat() + ' to ' + end.isoformat() + '",'
+                    '\n  "total_events": ' + str(len(events)) + ','
+                    '\n  "browser_opened": ' + ('true' if open_browser else 'false') + '\n}')
+            
+        except Exception as e:
+            return json.dumps({
+                "success": False,
+                "message": f"Error generating web view: {str(e)}"
+            })
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _get_base_html_template(title: str, additional_styles: str = "") -> str:
+        """Base HTML template with modern styling (cached, the CSS never changes)"""
+        return "".join((_HTML_HEAD_OPEN, title, _HTML_HEAD_STYLE, additional_styles, _HTML_HEAD_CLOSE))
+    
+    def _generate_view(self, view_type: str, events: List, start_date: datetime.date,
+                       end_date: datetime.date, conflict_ids: Set[int], out: TextIO,
+                       today: Optional[datetime.date] = None) -> None:
+        """Dispatch to the generator for view_type (anything unknown gets the list view)"""
+        if view_type == "calendar":
+            self._generate_calendar_view(events, start_date, end_date, conflict_ids, out, today)
+        elif view_type == "timeline":
+            self._generate_timeline_view(events, start_date, end_date, conflict_ids, out)
+        else:  # list view
+            self._generate_list_view(events, start_date, end_date, conflict_ids, out)
+    
+    def _empty_html(self, view_type: str, start_date: datetime.date, end_date: datetime.date,
+                    today: datetime.date) -> str:
+        """Page for a range with no events (cached per tool; today is part of
+        the key because the calendar view highlights the current day)"""
+        key = (view_type, start_date, end_date, today)
+        page = self._empty_pages.get(key)
+        if page is None:
+            if len(self._empty_pages) >= _MAX_EMPTY_PAGES:
+                self._empty_pages.clear()
+            out = io.StringIO()
+            self._generate_view(view_type, [], start_date, end_date, set(), out, today)
+            page = self._empty_pages[key] = out.getvalue()
+        return page
+    
+    @classmethod
+    def _index_events(cls, events: List,
+                      conflict_ids: Set[int]) -> Tuple[Dict[datetime.date, List[Dict[str, Any]]], int, int]:
+        """Group events by date in a single pass shared by all views
+        
+        Events come from ScheduleManager.get_schedule() in chronological order,
+        so dates and the events within each date are already sorted.
+        
+        Returns (rows_by_date, total_conflicts, priority_sum) where each row
+        holds the event and the values precomputed for rendering it, keyed by
+        the fields of _LIST_EVENT_TPL / _TIMELINE_EVENT_TPL. User supplied
+        text (title, description, location) is HTML-escaped here, once, so
+        the views can interpolate it directly.
+        """
+        esc = _esc
+        rows_by_date = defaultdict(list)
+        total_conflicts = 0
+        priority_sum = 0
         for event in events:
-            event_date = event.start_time.date()
-            if event_date not in events_by_date:
-                events_by_date[event_date] = []
-            events_by_date[event_date].append(event)
-        
-        # Check for conflicts
-        all_conflicts = self.schedule_manager.get_all_conflicts()
-        conflict_events = set()
-        for event1, event2 in all_conflicts:
-            conflict_events.add(event1.title)
-            conflict_events.add(event2.title)
-        
-        # Calculate stats
+            title = event.title
+            is_conflict = id(event) in conflict_ids
+            if is_conflict:
+                total_conflicts += 1
+                calendar_class = _DAY_EVENT_CONFLICT
+            elif event.priority >= 4:
+                calendar_class = _DAY_EVENT_HIGH
+            else:
+                calendar_class = _DAY_EVENT
+            priority_sum += event.priority
+            
+            duration = event.end_time - event.start_time
+            
+            rows_by_date[event.start_time.date()].append({
+                'event': event,
+                'is_conflict': is_conflict,
+                'calendar_class': calendar_class,
+                'card_class': _CARD_CONFLICT if is_conflict else _CARD,
+                'conflict_badge': _CONFLICT_BADGE if is_conflict else _EMPTY,
+                'title_html': esc(title),
+                'description_block': (f'<div class="event-details">{esc(event.description)}</div>'
+                                      if event.description else _EMPTY),
+                'location_block': (f'<div class="meta-item">📍 {esc(event.location)}</div>'
+                                   if event.location else _EMPTY),
+                'start_hm': event.start_time.strftime('%H:%M'),
+                'start_12': _fmt_time_12(event.start_time),
+                'end_12': _fmt_time_12(event.end_time),
+                'duration': f"{duration.total_seconds() / 3600:.1f}h",
+                'priority': str(event.priority),
+                'short_title': esc(title) if len(title) <= 15 else esc(title[:15]) + "..."
+            })
+        
+        return rows_by_date, total_conflicts, priority_sum
+    
+    def _generate_list_view(self, events: List, start_date: datetime.date, end_date: datetime.date,
+                            conflict_ids: Set[int], out: TextIO) -> None:
+        """Generate a beautiful list view of events, writing the HTML to out"""
+        
+        # Group events by date and calculate stats in one pass
+        events_by_date, total_conflicts, priority_sum = self._index_events(events, conflict_ids)
         total_events = len(events)
-        total_conflicts = len([e for e in events if e.title in conflict_events])
-        avg_priority = sum(e.priority for e in events) / len(events) if events else 0
+        avg_priority = priority_sum / total_events if events else 0
         
-        html = self._get_base_html_template("My Schedule - List View")
+        out.write(self._get_base_html_template("My Schedule - List View"))
         
-        html += f"""
+        out.write(f"""
         <div class="container">
             <div class="header">
                 <h1>📅 My Schedule</h1>
@@ -366,74 +535,42 @@ class ScheduleWebViewTool(Tool):
                         <div class="stat-label">Active Days</div>
                     </div>
                 </div>
-        """
+        """)
         
         if not events:
-            html += """
+            out.write("""
                 <div class="no-events">
                     <div class="no-events-icon">📅</div>
                     <h3>No events scheduled</h3>
                     <p>Your schedule is clear for this period.</p>
                 </div>
-            """
+            """)
         else:
-            # Sort dates
-            sorted_dates = sorted(events_by_date.keys())
-            
-            for date in sorted_dates:
-                day_events = sorted(events_by_date[date], key=lambda e: e.start_time)
-                
-                html += f"""
+            for date, day_rows in events_by_date.items():
+                out.write(f"""
                 <div style="margin-bottom: 30px;">
                     <h2 style="color: var(--primary-color); margin-bottom: 16px; padding-bottom: 8px; border-bottom: 2px solid var(--secondary-color);">
-                        {date.strftime('%A, %B %d, %Y')}
+                        {_fmt_day_header(date)}
                     </h2>
-                """
+                """)
                 
-                for event in day_events:
-                    is_conflict = event.title in conflict_events
-                    card_class = "event-card" + (" conflict-warning" if is_conflict else "")
-                    
-                    duration = event.end_time - event.start_time
-                    duration_str = f"{duration.total_seconds() / 3600:.1f}h"
-                    
-                    html += f"""
-                    <div class="{card_class}">
-                        <div class="event-title">
-                            {event.title}
-                            {f'<span class="conflict-badge">CONFLICT</span>' if is_conflict else ''}
-                        </div>
-                        <div class="event-time">
-                            🕐 {event.start_time.strftime('%I:%M %p')} - {event.end_time.strftime('%I:%M %p')}
-                            <span style="color: var(--text-secondary);">({duration_str})</span>
-                        </div>
-                        
-                        {f'<div class="event-details">{event.description}</div>' if event.description else ''}
-                        
-                        <div class="event-meta">
-                            {f'<div class="meta-item">📍 {event.location}</div>' if event.location else ''}
-                            <div class="meta-item">
-                                <span class="priority-badge priority-{event.priority}">
-                                    Priority {event.priority}
-                                </span>
-                            </div>
-                        </div>
-                    </div>
-                    """
+                for row in day_rows:
+                    out.write(_LIST_EVENT_TPL.format_map(row))
                 
-                html += "</div>"
+                out.write("</div>")
         
-        html += """
+        out.write("""
             </div>
         </div>
         </body>
         </html>
-        """
-        
-        return html
+        """)
     
-    def _generate_calendar_view(self, events: List, start_date: datetime.date, end_date: datetime.date) -> str:
-        """Generate a calendar grid view"""
+    def _generate_calendar_view(self, events: List, start_date: datetime.date, end_date: datetime.date,
+                                conflict_ids: Set[int], out: TextIO,
+                                today: Optional[datetime.date] = None) -> None:
+        """Generate a calendar grid view, writing the HTML to out (today: day to
+        highlight, defaults to the current date)"""
         
         additional_styles = """
         .calendar-grid {
@@ -500,13 +637,12 @@ class ScheduleWebViewTool(Tool):
         }
         """
         
-        html = self._get_base_html_template("My Schedule - Calendar View", additional_styles)
+        out.write(self._get_base_html_template("My Schedule - Calendar View", additional_styles))
         
         # Get calendar boundaries
         calendar_start = start_date.replace(day=1)
-        # Find the first Monday of the calendar view
-        while calendar_start.weekday() != 0:
-            calendar_start -= datetime.timedelta(days=1)
+        # Back up to the Monday on or before the 1st
+        calendar_start -= datetime.timedelta(days=calendar_start.weekday())
         
         # Find the last day of the calendar view
         calendar_end = end_date
@@ -514,25 +650,13 @@ class ScheduleWebViewTool(Tool):
             next_month = calendar_end.replace(day=28) + datetime.timedelta(days=4)
             calendar_end = next_month - datetime.timedelta(days=next_month.day)
         
-        while calendar_end.weekday() != 6:
-            calendar_end += datetime.timedelta(days=1)
+        # Extend to the Sunday on or after the last day
+        calendar_end += datetime.timedelta(days=6 - calendar_end.weekday())
         
         # Group events by date
-        events_by_date = {}
-        for event in events:
-            event_date = event.start_time.date()
-            if event_date not in events_by_date:
-                events_by_date[event_date] = []
-            events_by_date[event_date].append(event)
-        
-        # Check conflicts
-        all_conflicts = self.schedule_manager.get_all_conflicts()
-        conflict_events = set()
-        for event1, event2 in all_conflicts:
-            conflict_events.add(event1.title)
-            conflict_events.add(event2.title)
-        
-        html += f"""
+        events_by_date = self._index_events(events, conflict_ids)[0]
+        
+        out.write(f"""
         <div class="container">
             <div class="header">
                 <h1>📅 My Calendar</h1>
@@ -548,10 +672,11 @@ class ScheduleWebViewTool(Tool):
                     <div class="calendar-header">Friday</div>
                     <div class="calendar-header">Saturday</div>
                     <div class="calendar-header">Sunday</div>
-        """
+        """)
         
         current_date = calendar_start
-        today = datetime.date.today()
+        if today is None:
+            today = datetime.date.today()
         
         while current_date <= calendar_end:
             is_other_month = current_date.month != start_date.month
@@ -563,36 +688,28 @@ class ScheduleWebViewTool(Tool):
             if is_today:
                 day_class += " today"
             
-            html += f'<div class="{day_class}">'
-            html += f'<div class="day-number">{current_date.day}</div>'
+            out.write(f'<div class="{day_class}">')
+            out.write(f'<div class="day-number">{_DAY_STR[current_date.day]}</div>')
             
             # Add events for this day
-            if current_date in events_by_date:
-                for event in events_by_date[current_date]:
-                    event_class = "day-event"
-                    if event.title in conflict_events:
-                        event_class += " conflict"
-                    elif event.priority >= 4:
-                        event_class += " high-priority"
-                    
-                    time_str = event.start_time.strftime('%H:%M')
-                    html += f'<div class="{event_class}" title="{event.title} at {time_str}">{time_str} {event.title[:15]}{"..." if len(event.title) > 15 else ""}</div>'
+            for row in events_by_date.get(current_date, ()):
+                out.write(f'<div class="{row["calendar_class"]}" title="{row["title_html"]} at {row["start_hm"]}">'
+                          f'{row["start_hm"]} {row["short_title"]}</div>')
             
-            html += '</div>'
+            out.write('</div>')
             current_date += datetime.timedelta(days=1)
         
-        html += """
+        out.write("""
                 </div>
             </div>
         </div>
         </body>
         </html>
-        """
-        
-        return html
+        """)
     
-    def _generate_timeline_view(self, events: List, start_date: datetime.date, end_date: datetime.date) -> str:
-        """Generate a timeline view of events"""
+    def _generate_timeline_view(self, events: List, start_date: datetime.date, end_date: datetime.date,
+                                conflict_ids: Set[int], out: TextIO) -> None:
+        """Generate a timeline view of events, writing the HTML to out"""
         
         additional_styles = """
         .timeline {
@@ -645,24 +762,12 @@ class ScheduleWebViewTool(Tool):
         }
         """
         
-        html = self._get_base_html_template("My Schedule - Timeline View", additional_styles)
+        out.write(self._get_base_html_template("My Schedule - Timeline View", additional_styles))
         
         # Group events by date
-        events_by_date = {}
-        for event in events:
-            event_date = event.start_time.date()
-            if event_date not in events_by_date:
-                events_by_date[event_date] = []
-            events_by_date[event_date].append(event)
-        
-        # Check conflicts
-        all_conflicts = self.schedule_manager.get_all_conflicts()
-        conflict_events = set()
-        for event1, event2 in all_conflicts:
-            conflict_events.add(event1.title)
-            conflict_events.add(event2.title)
-        
-        html += f"""
+        events_by_date = self._index_events(events, conflict_ids)[0]
+        
+        out.write(f"""
         <div class="container">
             <div class="header">
                 <h1>⏰ My Timeline</h1>
@@ -671,64 +776,38 @@ class ScheduleWebViewTool(Tool):
             
             <div class="content">
                 <div class="timeline">
-        """
+        """)
         
         if not events:
-            html += """
+            out.write("""
                 <div class="no-events">
                     <div class="no-events-icon">⏰</div>
                     <h3>No events scheduled</h3>
                     <p>Your timeline is clear for this period.</p>
                 </div>
-            """
+            """)
         else:
-            sorted_dates = sorted(events_by_date.keys())
-            
-            for date in sorted_dates:
-                day_events = sorted(events_by_date[date], key=lambda e: e.start_time)
-                has_conflicts = any(event.title in conflict_events for event in day_events)
+            for date, day_rows in events_by_date.items():
+                item_class = (_TIMELINE_ITEM_CONFLICT if any(row['is_conflict'] for row in day_rows)
+                              else _TIMELINE_ITEM)
                 
-                html += f"""
-                <div class="timeline-item{'conflict' if has_conflicts else ''}">
+                out.write(f"""
+                <div class="{item_class}">
                     <div class="timeline-date">
-                        {date.strftime('%A, %B %d, %Y')}
+                        {_fmt_day_header(date)}
                     </div>
                     <div class="timeline-events">
-                """
+                """)
                 
-                for event in day_events:
-                    is_conflict = event.title in conflict_events
-                    card_class = "event-card" + (" conflict-warning" if is_conflict else "")
-                    
-                    html += f"""
-                    <div class="{card_class}" style="margin-bottom: 12px;">
-                        <div class="event-title">
-                            {event.title}
-                            {f'<span class="conflict-badge">CONFLICT</span>' if is_conflict else ''}
-                        </div>
-                        <div class="event-time">
-                            🕐 {event.start_time.strftime('%I:%M %p')} - {event.end_time.strftime('%I:%M %p')}
-                        </div>
-                        {f'<div class="event-details">{event.description}</div>' if event.description else ''}
-                        <div class="event-meta">
-                            {f'<div class="meta-item">📍 {event.location}</div>' if event.location else ''}
-                            <div class="meta-item">
-                                <span class="priority-badge priority-{event.priority}">
-                                    Priority {event.priority}
-                                </span>
-                            </div>
-                        </div>
-                    </div>
-                    """
+                for row in day_rows:
+                    out.write(_TIMELINE_EVENT_TPL.format_map(row))
                 
-                html += "</div></div>"
+                out.write("</div></div>")
         
-        html += """
+        out.write("""
                 </div>
             </div>
         </div>
         </body>
         </html>
-        """
-        
-        return html
+        """)
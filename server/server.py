@@ -8,75 +8,375 @@ import signal
 import sys
 import csv
 import uuid
-from datetime import datetime
+import collections
+import atexit
+import queue
+import threading
+from datetime import datetime, timedelta
 import os
 import importlib.util
 from pathlib import Path
 
+try:
+    import orjson  # Optional, much faster JSON encoding and decoding of messages
+except ImportError:
+    orjson = None
+
+# Sites that navigation requests can open, by keyword. The keywords are tried
+# in order and the first one found anywhere in the message wins.
+_URL_SUGGESTIONS = {
+    'github': 'https://github.com',
+    'linkedin': 'https://linkedin.com',
+    'upwork': 'https://upwork.com',
+    'fiverr': 'https://fiverr.com',
+    'freelancer': 'https://freelancer.com',
+    'behance': 'https://behance.net',
+    'dribbble': 'https://dribbble.com',
+    'stackoverflow': 'https://stackoverflow.com',
+    'google': 'https://google.com',
+    'youtube': 'https://youtube.com',
+    'twitter': 'https://twitter.com',
+    'facebook': 'https://facebook.com'
+}
+
+# Message types routed to the offers and schedule handlers
+_OFFERS_MESSAGE_TYPES = frozenset(('get_offers', 'update_offer_status'))
+_SCHEDULE_MESSAGE_TYPES = frozenset(('get_schedule', 'add_event', 'update_event', 'delete_event'))
+
+# Chat intent keywords, matched as substrings of the lowercased message. The
+# intents are checked in order (navigation > help > freelance > offers).
+_NAV_KEYWORDS = ('open', 'visit', 'go to', 'navigate')
+_HELP_KEYWORDS = ('help', 'what can you do', 'commands')
+_FREELANCE_KEYWORDS = ('freelance', 'work', 'project', 'client')
+_OFFERS_KEYWORDS = ('offer', 'offers', 'job', 'jobs')
+
+def _lazy_import(module_name):
+    """Import a module whose body only runs on first attribute access
+    
+    Modules already in sys.modules are returned as is. Raises ImportError
+    right away if the module cannot be found.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ImportError(f"No module named '{module_name}'")
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# _dumps returns str even with orjson: bytes would go out as binary frames,
+# which the extension's JSON.parse(event.data) cannot read
+if orjson is not None:
+    def _dumps(obj):
+        """Serialize an outgoing message to JSON text (datetimes as ISO 8601)"""
+        return orjson.dumps(obj).decode()
+else:
+    def _json_default(obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _dumps(obj):
+        """Serialize an outgoing message to JSON text (datetimes as ISO 8601)"""
+        return json.dumps(obj, default=_json_default)
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+_loads = orjson.loads if orjson is not None else json.loads
+
+if sys.version_info >= (3, 11):
+    # fromisoformat() accepts the trailing 'Z' sent by the extension since 3.11
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value):
+        """Parse an ISO 8601 timestamp, including a trailing 'Z' for UTC"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _chat_template(message):
+    """Serialize a fixed chat_answer once, leaving the trailing timestamp open
+    
+    The payload is completed per send by _stamp(); the result is the same text
+    json.dumps() gives for {"type", "message", "timestamp"}.
+    """
+    return json.dumps({"type": "chat_answer", "message": message})[:-1] + ', "timestamp": '
+
+def _stamp(template, now_ms):
+    """Complete a _chat_template() payload with a timestamp (ms since the epoch)"""
+    return f"{template}{now_ms}}}"
+
+def _error_template(message_type, **fields):
+    """Serialize the fixed part of an error response once, leaving message and timestamp open
+    
+    The payload is completed per send by _error_payload().
+    """
+    return json.dumps({"type": message_type, **fields})[:-1] + ', "message": '
+
+def _error_payload(template, message, now_ms):
+    """Complete an _error_template() payload with a message and a timestamp (ms since the epoch)"""
+    return f'{template}{_dumps(message)}, "timestamp": {now_ms}}}'
+
+_HELP_TEXT = """Here's what I can help you with:
+
+🌐 **Website Navigation**: Say "open LinkedIn", "go to GitHub", "visit Upwork", etc.
+💼 **Freelance Support**: Ask about freelance work, projects, or clients
+📋 **Offers Management**: Ask about job offers or opportunities
+💬 **General Chat**: I'll respond to your messages and questions
+🔗 **Quick Links**: I can open popular freelance platforms, social media, and development tools
+
+Try saying: "open GitHub", "help me with freelance work", or "show me job offers"!"""
+
+_CLARIFICATION_TEXT = "I'd be happy to help you open a website! I can open popular freelance platforms like Upwork, Fiverr, LinkedIn, GitHub, and more. Which site would you like to visit?"
+
+_ADVICE_OPTIONS = (
+    "As a freelancer, building a strong portfolio is crucial. Make sure to showcase your best work and client testimonials!",
+    "Time management is key in freelance work. Consider using tools like Toggl or Clockify to track your time effectively.",
+    "Don't undervalue your work! Research market rates and price your services competitively but fairly.",
+    "Building long-term client relationships is more valuable than one-off projects. Focus on delivering exceptional service!",
+    "Always have a clear contract before starting any project. This protects both you and your client.",
+    "Diversify your income streams - don't rely on just one client or platform for all your work.",
+    "Keep learning new skills to stay competitive. The freelance market is always evolving!"
+)
+
+# Static chat answers, serialized once: (logged text, payload template)
+_HELP_RESPONSE = (_HELP_TEXT, _chat_template(_HELP_TEXT))
+_CLARIFICATION_RESPONSE = (_CLARIFICATION_TEXT, _chat_template(_CLARIFICATION_TEXT))
+_ADVICE_RESPONSES = tuple(
+    (text, _chat_template(text))
+    for text in (f"Great question about freelancing! {advice}" for advice in _ADVICE_OPTIONS)
+)
+
+# Schedule error replies, serialized once up to the message
+_SCHEDULE_ERROR = _error_template("error")
+_EVENT_ADDED_ERROR = _error_template("event_added", success=False)
+_EVENT_UPDATED_ERROR = _error_template("event_updated", success=False)
+_EVENT_DELETED_ERROR = _error_template("event_deleted", success=False)
+
+# Sample event sent when the schedule system is unavailable; times are filled in per request
+_SAMPLE_EVENT = {
+    'id': '1',
+    'title': 'Sample Meeting',
+    'description': 'Sample event description',
+    'location': 'Sample location',
+    'priority': 3
+}
+
+# Sample photography offers, created when the Erwan offer system starts empty
+_SAMPLE_OFFERS = (
+    {
+        'client_name': 'Sarah Johnson',
+        'client_contact': 'sarah@johsonevents.com',
+        'client_company': 'Johnson Events Co.',
+        'job_description': 'Wedding photography for outdoor ceremony and reception. Need professional photographer with experience in natural lighting and candid shots.',
+        'date_time': datetime(2024, 12, 20, 14, 0),
+        'duration': '8 hours',
+        'location': 'Central Park, New York',
+        'payment_terms': '$2,500 for full day coverage',
+        'requirements': 'Professional camera equipment, 2+ years experience, portfolio required',
+        'event_type': 'wedding',
+        'photos_expected': 500,
+        'equipment_requirements': ['DSLR Camera', 'External Flash', 'Backup Equipment'],
+        'post_processing_requirements': 'Color correction, basic retouching, album-ready edits',
+        'delivery_format': 'digital_download',
+        'delivery_timeline': '2 weeks after event',
+        'additional_services': ['Engagement shoot', 'Print package'],
+        'source_url': 'https://example.com/wedding-photographer-needed'
+    },
+    {
+        'client_name': 'Tech Corp Inc.',
+        'client_contact': '+1-555-0123',
+        'client_company': 'Tech Corp Inc.',
+        'job_description': 'Corporate headshots for new employees. Professional business portraits needed for company website and marketing materials.',
+        'date_time': datetime(2024, 6, 25, 9, 0),
+        'duration': '4 hours',
+        'location': 'Downtown Office Building',
+        'payment_terms': '$150 per person (20 people)',
+        'requirements': 'Studio lighting setup, professional backdrop, business attire coordination',
+        'event_type': 'corporate',
+        'photos_expected': 60,
+        'equipment_requirements': ['Studio Lights', 'Backdrop', 'Professional Camera'],
+        'post_processing_requirements': 'Professional retouching, consistent lighting, business-appropriate editing',
+        'delivery_format': 'cloud_storage',
+        'delivery_timeline': '1 week after shoot',
+        'additional_services': ['LinkedIn profile optimization'],
+        'source_url': 'https://example.com/corporate-headshots'
+    },
+    {
+        'client_name': 'Maria Rodriguez',
+        'client_contact': 'maria.r@email.com',
+        'client_company': 'Self',
+        'job_description': 'Family portrait session at sunset. Looking for natural, candid shots of family of 5 including grandparents.',
+        'date_time': datetime(2024, 6, 18, 16, 0),
+        'duration': '2 hours',
+        'location': 'Beach Location, Miami',
+        'payment_terms': '$800 for 2-hour session',
+        'requirements': 'Experience with family photography, good with children, natural lighting expertise',
+        'event_type': 'family',
+        'photos_expected': 100,
+        'equipment_requirements': ['DSLR Camera', 'Prime Lens', 'Reflector'],
+        'post_processing_requirements': 'Natural color grading, light retouching, family-friendly editing',
+        'delivery_format': 'digital_download',
+        'delivery_timeline': '1 week after session',
+        'additional_services': ['Printed album options'],
+        'source_url': 'https://example.com/family-portraits'
+    }
+)
+
 class FreelainceServer:
     def __init__(self):
         self.clients = {}  # {client_id: {'websocket': ws, 'ip': ip, 'connected_at': timestamp}}
+        self._ws_to_id = {}  # {websocket: client_id}, reverse index of self.clients
+        self._ip_counts = collections.defaultdict(int)  # {ip: number of connected clients}
         self.port = 8080
         self.host = 'localhost'
         self.csv_file = 'conversations.csv'
-        self.processed_messages = set()  # Track processed messages to prevent duplicates
+        self.history_limit = 50  # Messages kept in memory per client IP for sync_history
+        self._recent_by_ip = None  # {client_ip: deque of history entries}, read from the CSV on first use
+        self.processed_messages = collections.OrderedDict()  # Recently processed messages (oldest first), to drop duplicates
+        self.max_processed_messages = 1000
+        self._offers_semaphore = asyncio.Semaphore(16)  # Offers requests handled concurrently
+        self._background_tasks = set()  # Keeps running handler tasks referenced until done
         self.shutdown = False  # Shutdown flag
+        self._shutdown_event = None  # asyncio.Event set on shutdown, created by start_server
+        self._loop = None
+        self.verbose = os.environ.get('FREELAINCE_VERBOSE') == '1'  # Print a line for every handled request
         self.offer_manager = None  # Will be initialized if Erwan system is available
         self.schedule_manager = None  # Will be initialized if schedule system is available
+        self._offer_module = None  # Lazily imported modules, set up by the init_* methods
+        self._offers_file = None
+        self._offers_journal = None  # Status changes made since the last full save (JSON Lines)
+        self._offers_dirty = False  # Offer changes not yet written to the backup file
+        self.offers_flush_interval = 30  # Seconds between offer backup writes
+        self._offers_save_lock = threading.Lock()  # Saves run in worker threads
+        self._schedule_module = None
+        self._PhotographyOffer = None  # Offer/event classes, cached by the ensure_* methods
+        self._Event = None
+        self._event_id_cache = {}  # {id(event): (event, client-facing id)}
+        self._schedule_handlers = {  # Schedule message type -> handler
+            'get_schedule': self.handle_get_schedule,
+            'add_event': self.handle_add_event,
+            'update_event': self.handle_update_event,
+            'delete_event': self.handle_delete_event,
+        }
         self.setup_csv_logging()
         self.init_offer_system()
         self.init_schedule_system()
         
     def setup_csv_logging(self):
-        """Initialize CSV file for conversation logging"""
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(['date', 'sender', 'message', 'client_id', 'client_ip', 'timestamp'])
+        """Initialize CSV file for conversation logging
+        
+        The file is kept open for the lifetime of the server and only written
+        by a background thread, which drains the rows queued by log_to_csv in
+        batches so disk I/O never blocks the event loop.
+        """
+        is_new = not os.path.exists(self.csv_file)
+        self._csv_file_handle = open(self.csv_file, 'a', newline='', encoding='utf-8', buffering=65536)
+        self._csv_writer = csv.writer(self._csv_file_handle)
+        if is_new:
+            self._csv_writer.writerow(['date', 'sender', 'message', 'client_id', 'client_ip', 'timestamp'])
+            self._csv_file_handle.flush()
+        self._log_queue = queue.Queue()
+        self._csv_lock = threading.Lock()  # Guards _csv_closed against rows queued while closing
+        self._csv_closed = False  # Set once the writer thread is stopped; rows are then appended directly
+        self._csv_thread = threading.Thread(target=self._csv_writer_loop, name='csv-logger', daemon=True)
+        self._csv_thread.start()
+        atexit.register(self.close_csv_logging)
+    
+    def _csv_writer_loop(self):
+        """Write queued CSV rows until the None sentinel is received"""
+        log_queue = self._log_queue
+        while True:
+            batch = [log_queue.get()]
+            try:
+                while True:
+                    batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            stop = batch[-1] is None
+            try:
+                self._csv_writer.writerows(self._csv_rows(filter(None, batch)))
+                self._csv_file_handle.flush()
+            except Exception as e:
+                print(f"⚠️ Error logging to CSV: {e}")
+            finally:
+                for _ in batch:
+                    log_queue.task_done()
+            if stop:
+                return
+    
+    @staticmethod
+    def _csv_rows(entries):
+        """Format queued (time.time(), sender, message, client_id, client_ip) entries as CSV rows"""
+        return [(datetime.fromtimestamp(t).isoformat(), sender, message, client_id, client_ip, int(t * 1000))
+                for t, sender, message, client_id, client_ip in entries]
+    
+    def flush_csv_log(self):
+        """Block until every row queued so far has been written to disk"""
+        self._log_queue.join()
+    
+    def close_csv_logging(self):
+        """Flush and close the CSV log file
+        
+        Rows logged afterwards (e.g. disconnections while the server stops)
+        are appended to the file directly by log_to_csv.
+        """
+        with self._csv_lock:
+            self._csv_closed = True
+            if self._csv_thread.is_alive():
+                self._log_queue.put(None)
+                self._csv_thread.join()
+            if not self._csv_file_handle.closed:
+                self._csv_file_handle.close()
                 
     def log_to_csv(self, sender, message, client_id, client_ip):
-        """Log conversation to CSV file"""
-        try:
-            with open(self.csv_file, 'a', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    datetime.now().isoformat(),
-                    sender,
-                    message,
-                    client_id,
-                    client_ip,
-                    int(time.time() * 1000)
-                ])
-        except Exception as e:
-            print(f"⚠️ Error logging to CSV: {e}")
+        """Queue a conversation row for the CSV writer thread (non-blocking)
+        
+        The clock is read once; the writer thread derives both the date and
+        the millisecond timestamp columns from it.
+        """
+        now = time.time()
+        entry = (now, sender, message, client_id, client_ip)
+        with self._csv_lock:
+            queued = not self._csv_closed
+            if queued:
+                self._log_queue.put_nowait(entry)
+        
+        if not queued:
+            # The writer thread has been stopped: append the row synchronously
+            try:
+                with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerows(self._csv_rows((entry,)))
+            except Exception as e:
+                print(f"⚠️ Error logging to CSV: {e}")
+        
+        # Keep the in-memory history in step with the file once it has been read
+        if self._recent_by_ip is not None and sender in ('user', 'bot'):
+            self._recent_by_ip[client_ip].append({
+                'sender': sender,
+                'message': message,
+                'timestamp': datetime.fromtimestamp(now).isoformat(),
+                'client_id': client_id
+            })
     
     def init_offer_system(self):
-        """Initialize the Erwan offer management system if available"""
+        """Register the Erwan offer management system if available
+        
+        The module is imported lazily and the offers (pickle backup or
+        samples) are only loaded by ensure_offer_system() on the first
+        offers request, so starting the server does not pay for them.
+        """
         try:
             # Try to import the Erwan offer management system
             erwan_path = Path(__file__).parent.parent / "Erwan"
             if erwan_path.exists():
                 sys.path.insert(0, str(erwan_path))
-                
-                # Import the offer management classes
-                from offer_manager import OfferManager, PhotographyOffer, OfferFinder
-                
-                self.offer_manager = OfferManager()
-                
-                # Try to load existing offers from pickle file
-                offers_file = erwan_path / "offers_backup.pickle"
-                if offers_file.exists():
-                    try:
-                        self.offer_manager.load_from_file(str(offers_file), "pickle")
-                        print(f"✅ Loaded {len(self.offer_manager)} existing offers from Erwan system")
-                    except Exception as e:
-                        print(f"⚠️ Could not load existing offers: {e}")
-                        
-                # Create sample offers if none exist
-                if len(self.offer_manager) == 0:
-                    self.create_sample_offers()
-                    
-                print("🎯 Offer management system initialized successfully")
+                self._offer_module = _lazy_import('offer_manager')
+                self._offers_file = erwan_path / "offers_backup.pickle"
+                self._offers_journal = erwan_path / "offers_journal.jsonl"
                 
             else:
                 print("⚠️ Erwan offer system not found - offers functionality will use sample data")
@@ -86,20 +386,55 @@ class FreelainceServer:
         except Exception as e:
             print(f"⚠️ Error initializing offer system: {e}")
     
+    def ensure_offer_system(self):
+        """Create the offer manager on first use (only attempted once)"""
+        offer_module, self._offer_module = self._offer_module, None
+        if offer_module is None:
+            return
+        
+        try:
+            # Import the offer management classes
+            self._PhotographyOffer = offer_module.PhotographyOffer
+            
+            self.offer_manager = offer_module.OfferManager()
+            
+            # Try to load existing offers from pickle file
+            offers_file = self._offers_file
+            if offers_file.exists():
+                try:
+                    self.offer_manager.load_from_file(str(offers_file), "pickle")
+                    print(f"✅ Loaded {len(self.offer_manager)} existing offers from Erwan system")
+                except Exception as e:
+                    print(f"⚠️ Could not load existing offers: {e}")
+            
+            # Re-apply status changes made after that save
+            if self.offer_manager.replay_status_journal(str(self._offers_journal)):
+                self._offers_dirty = True
+                    
+            # Create sample offers if none exist
+            if len(self.offer_manager) == 0:
+                self.create_sample_offers()
+                
+            print("🎯 Offer management system initialized successfully")
+            
+        except ImportError as e:
+            print(f"⚠️ Could not import Erwan offer system: {e}")
+        except Exception as e:
+            print(f"⚠️ Error initializing offer system: {e}")
+    
     def init_schedule_system(self):
-        """Initialize the schedule management system if available"""
+        """Register the schedule management system if available
+        
+        Like the offer system, the module (and smolagents with it) is only
+        imported when ensure_schedule_system() runs for the first schedule
+        request.
+        """
         try:
             # Try to import the schedule management system
             schedule_path = Path(__file__).parent.parent / "schedule"
             if schedule_path.exists():
                 sys.path.insert(0, str(schedule_path))
-                
-                # Import the schedule management classes
-                from schedule_agent import ScheduleManager, Event
-                
-                self.schedule_manager = ScheduleManager()
-                print(f"✅ Loaded {len(self.schedule_manager.events)} existing events from schedule system")
-                print("📅 Schedule management system initialized successfully")
+                self._schedule_module = _lazy_import('schedule_agent')
                 
             else:
                 print("⚠️ Schedule system not found - calendar functionality will use sample data")
@@ -109,116 +444,79 @@ class FreelainceServer:
         except Exception as e:
             print(f"⚠️ Error initializing schedule system: {e}")
     
+    def ensure_schedule_system(self):
+        """Create the schedule manager on first use (only attempted once)"""
+        schedule_module, self._schedule_module = self._schedule_module, None
+        if schedule_module is None:
+            return
+        
+        try:
+            # Import the schedule management classes
+            self._Event = schedule_module.Event
+            
+            self.schedule_manager = schedule_module.ScheduleManager()
+            print(f"✅ Loaded {len(self.schedule_manager.events)} existing events from schedule system")
+            print("📅 Schedule management system initialized successfully")
+            
+        except ImportError as e:
+            print(f"⚠️ Could not import schedule system: {e}")
+        except Exception as e:
+            print(f"⚠️ Error initializing schedule system: {e}")
+    
     def create_sample_offers(self):
         """Create sample offers for demonstration"""
         try:
-            from offer_manager import PhotographyOffer
-            
-            # Sample photography offers
-            sample_offers = [
-                {
-                    'client_name': 'Sarah Johnson',
-                    'client_contact': 'sarah@johsonevents.com',
-                    'client_company': 'Johnson Events Co.',
-                    'job_description': 'Wedding photography for outdoor ceremony and reception. Need professional photographer with experience in natural lighting and candid shots.',
-                    'date_time': datetime(2024, 12, 20, 14, 0),
-                    'duration': '8 hours',
-                    'location': 'Central Park, New York',
-                    'payment_terms': '$2,500 for full day coverage',
-                    'requirements': 'Professional camera equipment, 2+ years experience, portfolio required',
-                    'event_type': 'wedding',
-                    'photos_expected': 500,
-                    'equipment_requirements': ['DSLR Camera', 'External Flash', 'Backup Equipment'],
-                    'post_processing_requirements': 'Color correction, basic retouching, album-ready edits',
-                    'delivery_format': 'digital_download',
-                    'delivery_timeline': '2 weeks after event',
-                    'additional_services': ['Engagement shoot', 'Print package'],
-                    'source_url': 'https://example.com/wedding-photographer-needed'
-                },
-                {
-                    'client_name': 'Tech Corp Inc.',
-                    'client_contact': '+1-555-0123',
-                    'client_company': 'Tech Corp Inc.',
-                    'job_description': 'Corporate headshots for new employees. Professional business portraits needed for company website and marketing materials.',
-                    'date_time': datetime(2024, 6, 25, 9, 0),
-                    'duration': '4 hours',
-                    'location': 'Downtown Office Building',
-                    'payment_terms': '$150 per person (20 people)',
-                    'requirements': 'Studio lighting setup, professional backdrop, business attire coordination',
-                    'event_type': 'corporate',
-                    'photos_expected': 60,
-                    'equipment_requirements': ['Studio Lights', 'Backdrop', 'Professional Camera'],
-                    'post_processing_requirements': 'Professional retouching, consistent lighting, business-appropriate editing',
-                    'delivery_format': 'cloud_storage',
-                    'delivery_timeline': '1 week after shoot',
-                    'additional_services': ['LinkedIn profile optimization'],
-                    'source_url': 'https://example.com/corporate-headshots'
-                },
-                {
-                    'client_name': 'Maria Rodriguez',
-                    'client_contact': 'maria.r@email.com',
-                    'client_company': 'Self',
-                    'job_description': 'Family portrait session at sunset. Looking for natural, candid shots of family of 5 including grandparents.',
-                    'date_time': datetime(2024, 6, 18, 16, 0),
-                    'duration': '2 hours',
-                    'location': 'Beach Location, Miami',
-                    'payment_terms': '$800 for 2-hour session',
-                    'requirements': 'Experience with family photography, good with children, natural lighting expertise',
-                    'event_type': 'family',
-                    'photos_expected': 100,
-                    'equipment_requirements': ['DSLR Camera', 'Prime Lens', 'Reflector'],
-                    'post_processing_requirements': 'Natural color grading, light retouching, family-friendly editing',
-                    'delivery_format': 'digital_download',
-                    'delivery_timeline': '1 week after session',
-                    'additional_services': ['Printed album options'],
-                    'source_url': 'https://example.com/family-portraits'
-                }
-            ]
+            PhotographyOffer = self._PhotographyOffer
+            offers = [PhotographyOffer(**offer_data) for offer_data in _SAMPLE_OFFERS]
             
-            for offer_data in sample_offers:
-                try:
-                    offer = PhotographyOffer(**offer_data)
-                    offer_id = self.offer_manager.add_offer(offer)
-                    print(f"✅ Created sample offer: {offer_id[:8]} - {offer.client_name}")
-                except Exception as e:
-                    print(f"⚠️ Error creating sample offer: {e}")
+            for offer_id, offer in zip(self.offer_manager.add_offers(offers), offers):
+                print(f"✅ Created sample offer: {offer_id[:8]} - {offer.client_name}")
                     
         except Exception as e:
             print(f"⚠️ Error creating sample offers: {e}")
     
     def load_conversation_history(self, client_ip, limit=50):
-        """Load recent conversation history for a client IP"""
+        """Load recent conversation history for a client IP
+        
+        The CSV is read once, on the first request, into per-IP ring buffers
+        of the last history_limit user/bot messages; log_to_csv keeps them
+        up to date afterwards so later requests never touch the file.
+        """
         history = []
         try:
-            if not os.path.exists(self.csv_file):
-                return history
-                
-            with open(self.csv_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                all_rows = list(reader)
-                
-                # Filter messages for this IP, exclude system messages
-                relevant_messages = [
-                    row for row in all_rows 
-                    if row['client_ip'] == client_ip and 
-                    row['sender'] in ['user', 'bot']
-                ]
-                
-                # Get the last N messages
-                recent_messages = relevant_messages[-limit:] if len(relevant_messages) > limit else relevant_messages
-                
-                for row in recent_messages:
-                    history.append({
-                        'sender': row['sender'],
-                        'message': row['message'],
-                        'timestamp': row['date'],
-                        'client_id': row['client_id']
-                    })
+            if self._recent_by_ip is None:
+                self._recent_by_ip = self._read_recent_history()
+            
+            recent_messages = self._recent_by_ip.get(client_ip, ())
+            # Get the last N messages
+            history = list(recent_messages)[-limit:]
                     
         except Exception as e:
             print(f"⚠️ Error loading conversation history: {e}")
             
         return history
+    
+    def _read_recent_history(self):
+        """Stream the CSV once and keep the last history_limit user/bot messages per IP"""
+        recent_by_ip = collections.defaultdict(lambda: collections.deque(maxlen=self.history_limit))
+        
+        # Make sure rows still queued for the writer thread are included
+        self.flush_csv_log()
+        if not os.path.exists(self.csv_file):
+            return recent_by_ip
+            
+        with open(self.csv_file, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                # Exclude system messages
+                if row['sender'] in ('user', 'bot'):
+                    recent_by_ip[row['client_ip']].append({
+                        'sender': row['sender'],
+                        'message': row['message'],
+                        'timestamp': row['date'],
+                        'client_id': row['client_id']
+                    })
+        
+        return recent_by_ip
         
     async def register_client(self, websocket):
         """Register a new client connection with unique ID"""
@@ -228,15 +526,16 @@ class FreelainceServer:
         client_id = str(uuid.uuid4())[:8]  # Short UUID
         
         # Check if client from this IP already exists (but don't close it, just log)
-        existing_clients = [cid for cid, data in self.clients.items() if data['ip'] == client_ip]
-        if existing_clients:
+        if self._ip_counts[client_ip]:
             print(f"⚠️ Multiple connections from {client_ip}. New ID: {client_id}")
+        self._ip_counts[client_ip] += 1
         
         self.clients[client_id] = {
             'websocket': websocket,
             'ip': client_ip,
             'connected_at': time.time()
         }
+        self._ws_to_id[websocket] = client_id
         
         print(f"✅ New client connected: {client_id} from {client_ip}")
         self.log_to_csv('system', f'Client connected from {client_ip}', client_id, client_ip)
@@ -247,39 +546,42 @@ class FreelainceServer:
     async def unregister_client(self, websocket):
         """Unregister client connection"""
         # Find client by websocket
-        client_to_remove = None
-        for client_id, data in self.clients.items():
-            if data['websocket'] == websocket:
-                client_to_remove = client_id
-                break
+        client_to_remove = self._ws_to_id.pop(websocket, None)
                 
         if client_to_remove:
             client_data = self.clients[client_to_remove]
             client_ip = client_data['ip']
             print(f"❌ Client {client_to_remove} ({client_ip}) disconnected")
             self.log_to_csv('system', f'Client disconnected from {client_ip}', client_to_remove, client_ip)
-            del self.clients[client_to_remove]
+            self._forget_client(client_to_remove)
+    
+    def _forget_client(self, client_id):
+        """Remove a client from self.clients and the indexes kept alongside it"""
+        client_data = self.clients.pop(client_id)
+        self._ws_to_id.pop(client_data['websocket'], None)
+        
+        client_ip = client_data['ip']
+        self._ip_counts[client_ip] -= 1
+        if not self._ip_counts[client_ip]:
+            del self._ip_counts[client_ip]
         
     async def handle_message(self, websocket, message_data):
         """Handle incoming messages from clients"""
         # Find client ID by websocket
-        client_id = None
+        client_id = self._ws_to_id.get(websocket)
         client_ip = websocket.remote_address[0]
-        
-        for cid, data in self.clients.items():
-            if data['websocket'] == websocket:
-                client_id = cid
-                break
                 
         if not client_id:
             print(f"⚠️ Message from unregistered client {client_ip}")
             return
         
         try:
-            message = json.loads(message_data)
+            message = _loads(message_data)
+            message_type = message.get('type')
+            user_message = message.get('message', '')
             
             # Handle sync_history request
-            if message.get('type') == 'sync_history' or message.get('message') == 'sync_history':
+            if message_type == 'sync_history' or user_message == 'sync_history':
                 history = self.load_conversation_history(client_ip)
                 if history:
                     history_message = {
@@ -287,33 +589,40 @@ class FreelainceServer:
                         "history": history,
                         "timestamp": int(time.time() * 1000)
                     }
-                    await websocket.send(json.dumps(history_message))
-                    print(f"📜 Sent {len(history)} historical messages to {client_id}")
+                    await websocket.send(_dumps(history_message))
+                    if self.verbose:
+                        print(f"📜 Sent {len(history)} historical messages to {client_id}")
                 return
             
             # Handle non-chat messages (offers and schedule systems)
-            if message.get('type') in ['get_offers', 'update_offer_status']:
-                await self.handle_offers_message(websocket, message, client_id, client_ip)
+            if message_type in _OFFERS_MESSAGE_TYPES:
+                # Offers work (building the full list, saving) runs as its own task
+                # so this client's next messages are not queued behind it
+                task = asyncio.create_task(self.handle_offers_message(websocket, message, client_id, client_ip))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
                 return
-            elif message.get('type') in ['get_schedule', 'add_event', 'update_event', 'delete_event']:
+            elif message_type in _SCHEDULE_MESSAGE_TYPES:
                 await self.handle_schedule_message(websocket, message, client_id, client_ip)
                 return
             
-            # Create message hash to prevent duplicates for chat messages
-            message_hash = f"{client_id}:{message.get('message', '')}:{message.get('timestamp', time.time())}"
-            if message_hash in self.processed_messages:
-                print(f"🔄 Duplicate message ignored from {client_id}")
+            # Key chat messages by (client, text, timestamp) to prevent duplicates
+            processed_messages = self.processed_messages
+            message_hash = (client_id, user_message, message.get('timestamp', time.time()))
+            if message_hash in processed_messages:
+                if self.verbose:
+                    print(f"🔄 Duplicate message ignored from {client_id}")
                 return
             
-            self.processed_messages.add(message_hash)
-            # Keep only last 1000 message hashes to prevent memory bloat
-            if len(self.processed_messages) > 1000:
-                self.processed_messages = set(list(self.processed_messages)[-500:])
+            processed_messages[message_hash] = None
+            # Forget the oldest hash once the limit is reached to prevent memory bloat
+            if len(processed_messages) > self.max_processed_messages:
+                processed_messages.popitem(last=False)
             
-            print(f"📨 Received from {client_id} ({client_ip}): {message}")
+            if self.verbose:
+                print(f"📨 Received from {client_id} ({client_ip}): {message}")
             
             # Log incoming message
-            user_message = message.get('message', '')
             self.log_to_csv('user', user_message, client_id, client_ip)
             
             # Extract user message
@@ -322,17 +631,20 @@ class FreelainceServer:
             # Simulate processing delay
             await asyncio.sleep(random.uniform(0.5, 1.5))
             
+            # One timestamp for every frame of the reply
+            now_ms = int(time.time() * 1000)
+            
             # Determine response type based on message content
-            if any(keyword in user_message_lower for keyword in ['open', 'visit', 'go to', 'navigate']):
-                await self.handle_navigation_request(websocket, user_message_lower, user_message, client_id, client_ip)
-            elif any(keyword in user_message_lower for keyword in ['help', 'what can you do', 'commands']):
-                await self.send_help_message(websocket, client_id, client_ip)
-            elif any(keyword in user_message_lower for keyword in ['freelance', 'work', 'project', 'client']):
-                await self.send_freelance_advice(websocket, user_message, client_id, client_ip)
-            elif any(keyword in user_message_lower for keyword in ['offer', 'offers', 'job', 'jobs']):
-                await self.send_offers_info(websocket, client_id, client_ip)
+            if any(keyword in user_message_lower for keyword in _NAV_KEYWORDS):
+                await self.handle_navigation_request(websocket, user_message_lower, user_message, client_id, client_ip, now_ms)
+            elif any(keyword in user_message_lower for keyword in _HELP_KEYWORDS):
+                await self.send_help_message(websocket, client_id, client_ip, now_ms)
+            elif any(keyword in user_message_lower for keyword in _FREELANCE_KEYWORDS):
+                await self.send_freelance_advice(websocket, user_message, client_id, client_ip, now_ms)
+            elif any(keyword in user_message_lower for keyword in _OFFERS_KEYWORDS):
+                await self.send_offers_info(websocket, client_id, client_ip, now_ms)
             else:
-                await self.send_echo_response(websocket, user_message, client_id, client_ip)
+                await self.send_echo_response(websocket, user_message, client_id, client_ip, now_ms)
                 
         except json.JSONDecodeError:
             print(f"❌ Error parsing message from {client_id} ({client_ip})")
@@ -341,32 +653,16 @@ class FreelainceServer:
                 "message": "Sorry, I couldn't understand that message format.",
                 "timestamp": int(time.time() * 1000)
             }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_dumps(error_response))
             self.log_to_csv('system', error_response['message'], client_id, client_ip)
             
-    async def handle_navigation_request(self, websocket, user_message_lower, original_message, client_id, client_ip):
-        """Handle requests to open URLs"""
+    async def handle_navigation_request(self, websocket, user_message_lower, original_message, client_id, client_ip,
+                                        now_ms=None):
+        """Handle requests to open URLs (now_ms: reply timestamp, defaults to now)"""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
         # Simple URL detection and suggestions
-        url_suggestions = {
-            'github': 'https://github.com',
-            'linkedin': 'https://linkedin.com',
-            'upwork': 'https://upwork.com',
-            'fiverr': 'https://fiverr.com',
-            'freelancer': 'https://freelancer.com',
-            'behance': 'https://behance.net',
-            'dribbble': 'https://dribbble.com',
-            'stackoverflow': 'https://stackoverflow.com',
-            'google': 'https://google.com',
-            'youtube': 'https://youtube.com',
-            'twitter': 'https://twitter.com',
-            'facebook': 'https://facebook.com'
-        }
-        
-        found_url = None
-        for keyword, url in url_suggestions.items():
-            if keyword in user_message_lower:
-                found_url = url
-                break
+        found_url = next((url for keyword, url in _URL_SUGGESTIONS.items() if keyword in user_message_lower), None)
                 
         if found_url:
             # Send tab opening command
@@ -374,70 +670,62 @@ class FreelainceServer:
                 "type": "open_tab",
                 "url": found_url,
                 "message": f"Opening {found_url} for you!",
-                "timestamp": int(time.time() * 1000)
+                "timestamp": now_ms
             }
-            await websocket.send(json.dumps(tab_message))
             self.log_to_csv('system', f"Opened {found_url}", client_id, client_ip)
             
             # Follow up with a chat response
             followup_message = {
                 "type": "chat_answer",
                 "message": f"I've opened {found_url} in a new tab. Is there anything specific you'd like to do there?",
-                "timestamp": int(time.time() * 1000)
+                "timestamp": now_ms
             }
-            await websocket.send(json.dumps(followup_message))
+            await self.send_batch(websocket, tab_message, followup_message)
             self.log_to_csv('bot', followup_message['message'], client_id, client_ip)
         else:
             # Ask for clarification
-            clarification_message = {
-                "type": "chat_answer",
-                "message": "I'd be happy to help you open a website! I can open popular freelance platforms like Upwork, Fiverr, LinkedIn, GitHub, and more. Which site would you like to visit?",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(clarification_message))
-            self.log_to_csv('bot', clarification_message['message'], client_id, client_ip)
+            text, template = _CLARIFICATION_RESPONSE
+            await websocket.send(_stamp(template, now_ms))
+            self.log_to_csv('bot', text, client_id, client_ip)
             
-    async def send_help_message(self, websocket, client_id, client_ip):
+    async def send_batch(self, websocket, *messages):
+        """Send several messages to one client in a single frame
+        
+        The extension's background worker unpacks 'batch' messages and handles
+        each entry as if it had arrived on its own, in order.
+        """
+        await websocket.send(_dumps({"type": "batch", "messages": messages}))
+    
+    def broadcast(self, message):
+        """Send the same message to every connected client
+        
+        The message is serialized once and websockets.broadcast() writes the
+        same frame to each connection without waiting on any of them; clients
+        whose connection is closing are skipped.
+        """
+        websockets.broadcast(self._ws_to_id.keys(), _dumps(message))
+            
+    async def send_help_message(self, websocket, client_id, client_ip, now_ms=None):
         """Send help information"""
-        help_message = {
-            "type": "chat_answer",
-            "message": """Here's what I can help you with:
-
-🌐 **Website Navigation**: Say "open LinkedIn", "go to GitHub", "visit Upwork", etc.
-💼 **Freelance Support**: Ask about freelance work, projects, or clients
-📋 **Offers Management**: Ask about job offers or opportunities
-💬 **General Chat**: I'll respond to your messages and questions
-🔗 **Quick Links**: I can open popular freelance platforms, social media, and development tools
-
-Try saying: "open GitHub", "help me with freelance work", or "show me job offers"!""",
-            "timestamp": int(time.time() * 1000)
-        }
-        await websocket.send(json.dumps(help_message))
-        self.log_to_csv('bot', help_message['message'], client_id, client_ip)
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        text, template = _HELP_RESPONSE
+        await websocket.send(_stamp(template, now_ms))
+        self.log_to_csv('bot', text, client_id, client_ip)
         
-    async def send_freelance_advice(self, websocket, original_message, client_id, client_ip):
+    async def send_freelance_advice(self, websocket, original_message, client_id, client_ip, now_ms=None):
         """Send freelance-related advice"""
-        advice_options = [
-            "As a freelancer, building a strong portfolio is crucial. Make sure to showcase your best work and client testimonials!",
-            "Time management is key in freelance work. Consider using tools like Toggl or Clockify to track your time effectively.",
-            "Don't undervalue your work! Research market rates and price your services competitively but fairly.",
-            "Building long-term client relationships is more valuable than one-off projects. Focus on delivering exceptional service!",
-            "Always have a clear contract before starting any project. This protects both you and your client.",
-            "Diversify your income streams - don't rely on just one client or platform for all your work.",
-            "Keep learning new skills to stay competitive. The freelance market is always evolving!"
-        ]
-        
-        advice = random.choice(advice_options)
-        response = {
-            "type": "chat_answer", 
-            "message": f"Great question about freelancing! {advice}",
-            "timestamp": int(time.time() * 1000)
-        }
-        await websocket.send(json.dumps(response))
-        self.log_to_csv('bot', response['message'], client_id, client_ip)
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        text, template = random.choice(_ADVICE_RESPONSES)
+        await websocket.send(_stamp(template, now_ms))
+        self.log_to_csv('bot', text, client_id, client_ip)
 
-    async def send_offers_info(self, websocket, client_id, client_ip):
+    async def send_offers_info(self, websocket, client_id, client_ip, now_ms=None):
         """Send information about offers"""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        self.ensure_offer_system()
         if self.offer_manager and len(self.offer_manager) > 0:
             offer_count = len(self.offer_manager)
             response_message = f"I have {offer_count} job offers available! These include photography gigs, corporate work, and family sessions. You can view detailed information about each offer through the offers system."
@@ -447,83 +735,83 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
         response = {
             "type": "chat_answer",
             "message": response_message,
-            "timestamp": int(time.time() * 1000)
+            "timestamp": now_ms
         }
-        await websocket.send(json.dumps(response))
+        await websocket.send(_dumps(response))
         self.log_to_csv('bot', response['message'], client_id, client_ip)
         
-    async def send_echo_response(self, websocket, original_message, client_id, client_ip):
+    async def send_echo_response(self, websocket, original_message, client_id, client_ip, now_ms=None):
         """Send echo response for general messages"""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
         response = {
             "type": "bot_response",
             "message": f"Echo: {original_message}",
-            "timestamp": int(time.time() * 1000),
+            "timestamp": now_ms,
             "original_message": original_message
         }
-        await websocket.send(json.dumps(response))
+        await websocket.send(_dumps(response))
         self.log_to_csv('bot', response['message'], client_id, client_ip)
     
     async def handle_offers_message(self, websocket, message, client_id, client_ip):
-        """Handle offers-related messages"""
+        """Handle offers-related messages (at most 16 at a time across all clients)"""
         message_type = message.get('type')
         
-        try:
-            if message_type == 'get_offers':
-                await self.handle_get_offers(websocket, message, client_id, client_ip)
-            elif message_type == 'update_offer_status':
-                await self.handle_update_offer_status(websocket, message, client_id, client_ip)
-            else:
-                print(f"⚠️ Unknown offers message type: {message_type}")
-                
-        except Exception as e:
-            print(f"❌ Error handling offers message: {e}")
-            error_response = {
-                "type": "error",
-                "message": f"Error processing offers request: {str(e)}",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(error_response))
+        async with self._offers_semaphore:
+            try:
+                self.ensure_offer_system()
+                if message_type == 'get_offers':
+                    await self.handle_get_offers(websocket, message, client_id, client_ip)
+                elif message_type == 'update_offer_status':
+                    await self.handle_update_offer_status(websocket, message, client_id, client_ip)
+                else:
+                    print(f"⚠️ Unknown offers message type: {message_type}")
+                    
+            except websockets.exceptions.ConnectionClosed:
+                pass  # Runs as a separate task, so nothing else would handle this
+            except Exception as e:
+                print(f"❌ Error handling offers message: {e}")
+                error_response = {
+                    "type": "error",
+                    "message": f"Error processing offers request: {str(e)}",
+                    "timestamp": int(time.time() * 1000)
+                }
+                await websocket.send(_dumps(error_response))
     
     async def handle_get_offers(self, websocket, message, client_id, client_ip):
         """Handle get_offers request"""
-        print(f"📋 Get offers request from {client_id}")
+        if self.verbose:
+            print(f"📋 Get offers request from {client_id}")
         
         try:
             if self.offer_manager:
-                # Get offers data from the manager
-                offers_data = self.offer_manager.list_offers(format_output=False)
-                
-                # Convert offers to the format expected by the frontend
+                # Get every offer summary with its full details in one pass
+                # and convert them to the format expected by the frontend
                 formatted_offers = []
-                for offer_summary in offers_data:
-                    # Get full offer details
-                    full_offer = self.offer_manager.get_offer_by_id(offer_summary['offer_id'])
+                for offer_summary, full_offer in self.offer_manager.get_offers_with_details():
+                    formatted_offer = {
+                        'offer_id': offer_summary['offer_id'],
+                        'job_title': offer_summary['job_title'],
+                        'client_name': offer_summary['client_name'],
+                        'client_company': full_offer.client_company,
+                        'client_contact': full_offer.client_contact,
+                        'date_time': offer_summary['date_time'],
+                        'location': offer_summary['location'],
+                        'status': offer_summary['status'],
+                        'description': offer_summary['description'],
+                        'source_url': offer_summary.get('source_url'),
+                        'created_at': offer_summary['created_at'],
+                        'payment_terms': full_offer.payment_terms,
+                        'requirements': full_offer.requirements,
+                        'duration': full_offer.duration
+                    }
                     
-                    if full_offer:
-                        # Convert to frontend format
-                        formatted_offer = {
-                            'offer_id': offer_summary['offer_id'],
-                            'job_title': offer_summary['job_title'],
-                            'client_name': offer_summary['client_name'],
-                            'client_company': full_offer.client_company,
-                            'client_contact': full_offer.client_contact,
-                            'date_time': offer_summary['date_time'].isoformat(),
-                            'location': offer_summary['location'],
-                            'status': offer_summary['status'],
-                            'description': offer_summary['description'],
-                            'source_url': offer_summary.get('source_url'),
-                            'created_at': offer_summary['created_at'].isoformat(),
-                            'payment_terms': full_offer.payment_terms,
-                            'requirements': full_offer.requirements,
-                            'duration': full_offer.duration
-                        }
+                    # Add specific details if available
+                    specific_details = full_offer.get_specific_details()
+                    if specific_details:
+                        formatted_offer['specific_details'] = specific_details
                         
-                        # Add specific details if available
-                        specific_details = full_offer.get_specific_details()
-                        if specific_details:
-                            formatted_offer['specific_details'] = specific_details
-                            
-                        formatted_offers.append(formatted_offer)
+                    formatted_offers.append(formatted_offer)
                 
                 response = {
                     "type": "offers_data",
@@ -532,7 +820,8 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                     "total_count": len(formatted_offers)
                 }
                 
-                print(f"✅ Sending {len(formatted_offers)} offers to {client_id}")
+                if self.verbose:
+                    print(f"✅ Sending {len(formatted_offers)} offers to {client_id}")
                 
             else:
                 # Fallback: send sample data if offer manager is not available
@@ -545,7 +834,7 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                 }
                 print(f"⚠️ Offer manager not available, sending empty response to {client_id}")
             
-            await websocket.send(json.dumps(response))
+            await websocket.send(_dumps(response))
             self.log_to_csv('system', f"Sent {response.get('total_count', 0)} offers", client_id, client_ip)
             
         except Exception as e:
@@ -555,14 +844,15 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                 "message": f"Error retrieving offers: {str(e)}",
                 "timestamp": int(time.time() * 1000)
             }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_dumps(error_response))
     
     async def handle_update_offer_status(self, websocket, message, client_id, client_ip):
         """Handle update_offer_status request"""
         offer_id = message.get('offer_id')
         new_status = message.get('status')
         
-        print(f"📝 Update offer status request from {client_id}: {offer_id} -> {new_status}")
+        if self.verbose:
+            print(f"📝 Update offer status request from {client_id}: {offer_id} -> {new_status}")
         
         try:
             if self.offer_manager and offer_id and new_status:
@@ -576,16 +866,13 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                         "success": True,
                         "timestamp": int(time.time() * 1000)
                     }
-                    print(f"✅ Updated offer {offer_id[:8]} status to {new_status}")
+                    if self.verbose:
+                        print(f"✅ Updated offer {offer_id[:8]} status to {new_status}")
                     
-                    # Save changes to file
-                    try:
-                        erwan_path = Path(__file__).parent.parent / "Erwan"
-                        offers_file = erwan_path / "offers_backup.pickle"
-                        self.offer_manager.save_to_file(str(offers_file), "pickle")
-                        print(f"💾 Saved offers to {offers_file}")
-                    except Exception as e:
-                        print(f"⚠️ Could not save offers to file: {e}")
+                    # Journal the change right away; the full backup is rewritten
+                    # by the periodic flush (or on shutdown)
+                    self._offers_dirty = True
+                    await asyncio.to_thread(self.journal_offer_status, offer_id, new_status)
                         
                 else:
                     response = {
@@ -609,7 +896,7 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                 }
                 print(f"❌ Invalid update request: offer_id={offer_id}, status={new_status}, manager={self.offer_manager is not None}")
             
-            await websocket.send(json.dumps(response))
+            await websocket.send(_dumps(response))
             self.log_to_csv('system', f"Updated {offer_id} to {new_status}", client_id, client_ip)
             
         except Exception as e:
@@ -619,96 +906,141 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                 "message": f"Error updating offer status: {str(e)}",
                 "timestamp": int(time.time() * 1000)
             }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_dumps(error_response))
+    
+    def save_offers(self):
+        """Write the offers to the pickle backup if they changed since the last save
+        
+        Blocking; the server calls it through asyncio.to_thread() so pickling
+        and disk I/O do not hold up the event loop.
+        """
+        with self._offers_save_lock:
+            if not self._offers_dirty or not self.offer_manager:
+                return
+            
+            self._offers_dirty = False
+            try:
+                if not self.offer_manager.save_to_file(str(self._offers_file), "pickle"):
+                    raise OSError("save_to_file failed")
+                # Everything journaled so far is now in the full save
+                self._offers_journal.unlink(missing_ok=True)
+                print(f"💾 Saved offers to {self._offers_file}")
+            except Exception as e:
+                self._offers_dirty = True
+                print(f"⚠️ Could not save offers to file: {e}")
+    
+    def journal_offer_status(self, offer_id, status):
+        """Append one status change to the offers journal (blocking, like save_offers)"""
+        with self._offers_save_lock:
+            self.offer_manager.append_status_journal(str(self._offers_journal), offer_id, status)
+    
+    async def flush_offers_periodically(self):
+        """Save pending offer changes every offers_flush_interval seconds"""
+        while not self.shutdown:
+            await asyncio.sleep(self.offers_flush_interval)
+            await asyncio.to_thread(self.save_offers)
     
     async def handle_schedule_message(self, websocket, message, client_id, client_ip):
         """Handle schedule-related messages"""
         message_type = message.get('type')
+        self.ensure_schedule_system()
         
-        if message_type == 'get_schedule':
-            await self.handle_get_schedule(websocket, message, client_id, client_ip)
-        elif message_type == 'add_event':
-            await self.handle_add_event(websocket, message, client_id, client_ip)
-        elif message_type == 'update_event':
-            await self.handle_update_event(websocket, message, client_id, client_ip)
-        elif message_type == 'delete_event':
-            await self.handle_delete_event(websocket, message, client_id, client_ip)
+        handler = self._schedule_handlers.get(message_type)
+        if handler:
+            await handler(websocket, message, client_id, client_ip)
         else:
             print(f"❌ Unknown schedule message type: {message_type}")
     
+    def _event_id(self, event):
+        """Return the client-facing id of an event, computed once per Event object
+        
+        The id is derived from the title and start time the event had when it
+        was first sent, and stays the same if the event is later edited in place.
+        The event is kept in the cache entry so a recycled id() is never matched.
+        """
+        entry = self._event_id_cache.get(id(event))
+        if entry is None or entry[0] is not event:
+            entry = self._event_id_cache[id(event)] = (event, str(hash((event.title, event.start_time))))
+        return entry[1]
+    
     async def handle_get_schedule(self, websocket, message, client_id, client_ip):
         """Handle get_schedule request"""
-        print(f"📅 Get schedule request from {client_id}")
+        if self.verbose:
+            print(f"📅 Get schedule request from {client_id}")
+        ts = int(time.time() * 1000)
         
         try:
             if self.schedule_manager:
-                # Format events for the client
-                formatted_events = []
-                for event in self.schedule_manager.events:
-                    formatted_events.append({
-                        'id': str(hash(f"{event.title}{event.start_time}")),  # Generate consistent ID
+                # Format events for the client. orjson could encode the Event
+                # dataclasses directly, but the calendar needs the 'id' field,
+                # which Event does not have.
+                event_id = self._event_id
+                formatted_events = [
+                    {
+                        'id': event_id(event),
                         'title': event.title,
-                        'start_time': event.start_time.isoformat(),
-                        'end_time': event.end_time.isoformat(),
+                        'start_time': event.start_time,
+                        'end_time': event.end_time,
                         'description': event.description,
                         'location': event.location,
                         'priority': event.priority
-                    })
+                    }
+                    for event in self.schedule_manager.events
+                ]
                 
                 response = {
                     "type": "schedule_data",
                     "events": formatted_events,
-                    "timestamp": int(time.time() * 1000),
+                    "timestamp": ts,
                     "total_count": len(formatted_events)
                 }
                 
-                print(f"✅ Sending {len(formatted_events)} events to {client_id}")
+                if len(self._event_id_cache) > len(formatted_events):
+                    # Drop ids of events that are no longer scheduled
+                    self._event_id_cache = {
+                        id(event): self._event_id_cache[id(event)]
+                        for event in self.schedule_manager.events
+                    }
+                
+                if self.verbose:
+                    print(f"✅ Sending {len(formatted_events)} events to {client_id}")
                 
             else:
                 # Fallback: send sample data if schedule manager is not available
+                now = datetime.now()
                 sample_events = [
-                    {
-                        'id': '1',
-                        'title': 'Sample Meeting',
-                        'start_time': datetime.now().isoformat(),
-                        'end_time': datetime.now().replace(hour=datetime.now().hour + 1).isoformat(),
-                        'description': 'Sample event description',
-                        'location': 'Sample location',
-                        'priority': 3
-                    }
+                    {**_SAMPLE_EVENT, 'start_time': now, 'end_time': now + timedelta(hours=1)}
                 ]
                 response = {
                     "type": "schedule_data",
                     "events": sample_events,
-                    "timestamp": int(time.time() * 1000),
+                    "timestamp": ts,
                     "total_count": len(sample_events),
                     "message": "Schedule management system not available - showing sample data"
                 }
                 print(f"⚠️ Schedule manager not available, sending sample data to {client_id}")
             
-            await websocket.send(json.dumps(response))
+            await websocket.send(_dumps(response))
             self.log_to_csv('system', f"Sent {response.get('total_count', 0)} events", client_id, client_ip)
             
         except Exception as e:
             print(f"❌ Error getting schedule: {e}")
-            error_response = {
-                "type": "error",
-                "message": f"Error retrieving schedule: {str(e)}",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_error_payload(_SCHEDULE_ERROR, f"Error retrieving schedule: {str(e)}", ts))
     
     async def handle_add_event(self, websocket, message, client_id, client_ip):
         """Handle add_event request"""
-        print(f"📅 Add event request from {client_id}: {message.get('title', 'No title')}")
+        title = message.get('title', 'No title')
+        if self.verbose:
+            print(f"📅 Add event request from {client_id}: {title}")
+        ts = int(time.time() * 1000)
         
         try:
             if self.schedule_manager:
-                from schedule_agent import Event
+                Event = self._Event
                 
                 # Parse datetime strings
-                start_time = datetime.fromisoformat(message['start_time'].replace('Z', '+00:00'))
-                end_time = datetime.fromisoformat(message['end_time'].replace('Z', '+00:00'))
+                start_time = _parse_iso(message['start_time'])
+                end_time = _parse_iso(message['end_time'])
                 
                 # Create new event
                 new_event = Event(
@@ -726,92 +1058,83 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                     "type": "event_added",
                     "success": result['success'],
                     "message": result['message'],
-                    "timestamp": int(time.time() * 1000)
+                    "timestamp": ts
                 }
                 
                 if result['conflicts']:
+                    # ScheduleManager.add_event() returns the conflicts already
+                    # serialized with Event.to_dict() (ISO 8601 times)
                     response['conflicts'] = [
                         {
-                            'title': conflict.title,
-                            'start_time': conflict.start_time.isoformat(),
-                            'end_time': conflict.end_time.isoformat()
+                            'title': conflict['title'],
+                            'start_time': conflict['start_time'],
+                            'end_time': conflict['end_time']
                         }
                         for conflict in result['conflicts']
                     ]
                 
-                print(f"✅ Added event '{message['title']}' for {client_id}")
+                if self.verbose:
+                    print(f"✅ Added event '{title}' for {client_id}")
                 
             else:
                 response = {
                     "type": "event_added",
                     "success": False,
                     "message": "Schedule management system not available",
-                    "timestamp": int(time.time() * 1000)
+                    "timestamp": ts
                 }
                 print(f"⚠️ Schedule manager not available for {client_id}")
             
-            await websocket.send(json.dumps(response))
-            self.log_to_csv('system', f"Added event: {message.get('title', 'No title')}", client_id, client_ip)
+            await websocket.send(_dumps(response))
+            self.log_to_csv('system', f"Added event: {title}", client_id, client_ip)
             
         except Exception as e:
             print(f"❌ Error adding event: {e}")
-            error_response = {
-                "type": "event_added",
-                "success": False,
-                "message": f"Error adding event: {str(e)}",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_error_payload(_EVENT_ADDED_ERROR, f"Error adding event: {str(e)}", ts))
     
     async def handle_update_event(self, websocket, message, client_id, client_ip):
         """Handle update_event request"""
-        print(f"📅 Update event request from {client_id}: {message.get('title', 'No title')}")
+        title = message.get('title', 'No title')
+        if self.verbose:
+            print(f"📅 Update event request from {client_id}: {title}")
+        ts = int(time.time() * 1000)
         
         try:
             response = {
                 "type": "event_updated",
                 "success": True,
                 "message": "Event updated successfully (simulated)",
-                "timestamp": int(time.time() * 1000)
+                "timestamp": ts
             }
             
-            await websocket.send(json.dumps(response))
-            self.log_to_csv('system', f"Updated event: {message.get('title', 'No title')}", client_id, client_ip)
+            await websocket.send(_dumps(response))
+            self.log_to_csv('system', f"Updated event: {title}", client_id, client_ip)
             
         except Exception as e:
             print(f"❌ Error updating event: {e}")
-            error_response = {
-                "type": "event_updated",
-                "success": False,
-                "message": f"Error updating event: {str(e)}",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_error_payload(_EVENT_UPDATED_ERROR, f"Error updating event: {str(e)}", ts))
     
     async def handle_delete_event(self, websocket, message, client_id, client_ip):
         """Handle delete_event request"""
-        print(f"📅 Delete event request from {client_id}: {message.get('id', 'No ID')}")
+        event_id = message.get('id', 'No ID')
+        if self.verbose:
+            print(f"📅 Delete event request from {client_id}: {event_id}")
+        ts = int(time.time() * 1000)
         
         try:
             response = {
                 "type": "event_deleted",
                 "success": True,
                 "message": "Event deleted successfully (simulated)",
-                "timestamp": int(time.time() * 1000)
+                "timestamp": ts
             }
             
-            await websocket.send(json.dumps(response))
-            self.log_to_csv('system', f"Deleted event: {message.get('id', 'No ID')}", client_id, client_ip)
+            await websocket.send(_dumps(response))
+            self.log_to_csv('system', f"Deleted event: {event_id}", client_id, client_ip)
             
         except Exception as e:
             print(f"❌ Error deleting event: {e}")
-            error_response = {
-                "type": "event_deleted",
-                "success": False,
-                "message": f"Error deleting event: {str(e)}",
-                "timestamp": int(time.time() * 1000)
-            }
-            await websocket.send(json.dumps(error_response))
+            await websocket.send(_error_payload(_EVENT_DELETED_ERROR, f"Error deleting event: {str(e)}", ts))
         
     async def handle_client(self, websocket, path):
         """Handle individual client connections"""
@@ -834,29 +1157,41 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
                 "message": "Server is shutting down. Goodbye! 👋",
                 "timestamp": int(time.time() * 1000)
             }
-            message_str = json.dumps(shutdown_message)
+            # Serialized once and shared by every send; kept as str since the
+            # extension only parses text frames
+            message_str = _dumps(shutdown_message)
             
-            # Send to all connected clients
-            disconnected = []
-            for client_id, data in self.clients.items():
-                try:
-                    await data['websocket'].send(message_str)
+            # Send to all connected clients at once, so one slow peer does not hold up the others
+            # Snapshot the clients: the dict can change while the sends are awaited
+            clients = tuple(self.clients.items())
+            results = await asyncio.gather(
+                *(data['websocket'].send(message_str) for _, data in clients),
+                return_exceptions=True
+            )
+            
+            disconnected = set()
+            for (client_id, data), result in zip(clients, results):
+                if isinstance(result, BaseException):
+                    disconnected.add(client_id)
+                else:
                     self.log_to_csv('system', shutdown_message['message'], client_id, data['ip'])
-                except:
-                    disconnected.append(client_id)
             
-            # Remove disconnected clients
-            for client_id in disconnected:
-                del self.clients[client_id]
+            # Remove disconnected clients, unless they already unregistered during the sends
+            for client_id in disconnected & self.clients.keys():
+                self._forget_client(client_id)
                 
     def signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         print('\n🛑 Shutting down server gracefully...')
         self.shutdown = True
+        if self._shutdown_event is not None:
+            self._loop.call_soon_threadsafe(self._shutdown_event.set)
         
     async def start_server(self):
         """Start the WebSocket server"""
         print('🚀 Freelaince WebSocket server starting...')
+        self._loop = asyncio.get_running_loop()
+        self._shutdown_event = asyncio.Event()
         
         # Set up signal handlers (non-blocking)
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -881,17 +1216,23 @@ Try saying: "open GitHub", "help me with freelance work", or "show me job offers
             print('🛑 Press Ctrl+C to stop the server')
             print('')
             
+            offers_flusher = asyncio.create_task(self.flush_offers_periodically())
+            
             # Keep the server running until shutdown
             try:
-                while not self.shutdown:
-                    await asyncio.sleep(0.1)
+                await self._shutdown_event.wait()
             except KeyboardInterrupt:
                 print('\n🛑 Shutting down server gracefully...')
                 self.shutdown = True
             
             # Shutdown sequence
+            offers_flusher.cancel()
+            await asyncio.to_thread(self.save_offers)
             await self.send_shutdown_message()
-            print('✅ Server stopped cleanly')
+        
+        # Closing the server above also unregisters (and logs) the remaining clients
+        self.close_csv_logging()
+        print('✅ Server stopped cleanly')
 
 if __name__ == '__main__':
     server = FreelainceServer()